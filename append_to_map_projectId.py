@@ -7,50 +7,75 @@ import json
 import re
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Status prefix such as "[Completed] " stripped from project names
+_STATUS_PREFIX_RE = re.compile(r'^\[(Completed|Cancelled|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*')
+
+# Name keywords that mark a project as on-going
+_ONGOING_KEYWORDS_RE = re.compile(
+    r"m&e|monitoring|evaluation|support|expert|qa/qc|development|maintenance|report|coordination",
+    re.IGNORECASE,
+)
+
+# New projects based on the provided data, deduplicated in order
+_NEW_PROJECT_ENTRIES: Tuple[Tuple[Optional[str], str], ...] = tuple(dict.fromkeys([
+    # Projects without IDs (marked with -)
+    (None, "ETP M&E Work"),
+    (None, "Support to NREP"),
+    (None, "Vietnam Energy Transition Expert (QA/QC)"),
+    (None, "PSA TAF coordination support"),
+    (None, "General support to ETP (pooled fund)"),
+    (None, "General support to ETP (EU project)"),
+    (None, "2025 semi-annual report for pooled fund 2024 annual reports for pooled fund and EU"),
+    (None, "QA/QC support to ETP"),
+    (None, "QA/QC support to ETP"),  # Duplicate entry (dropped by dict.fromkeys)
+    (None, "General support to ETP"),
+    (None, "ETP Dashboards Development and Maintenance"),
+    (None, "-"),  # Empty entry
+    
+    # Projects with ETP IDs
+    ("ETP-041-INO-12", "Supporting JETP Secretariat"),
+    ("ETP-056-INO-18", "Financial Expertise for PT. SMI (Sarana Multi Infrastruktur (Persero), a Special Mission Vehicle under the Ministry of Finance)"),
+    ("ETP-066-PHI-17", "NREP Update"),
+    ("ETP-078-PHI-20", "Streamlining Regulations to Support Energy Transition"),
+    ("ETP-022-PHI-7", "Support to Renewable Energy Procurement Mechanisms (including GEAP)"),
+    ("ETP-037-INO-10", "Integrated Eco-friendly Public Transport"),
+    ("ETP-062-INO-22", "JETP Power System Analysis"),
+    ("ETP-040-PHI-11", "Energy Regulation Development for RE Integration"),
+    ("ETP-050-PHI-14", "Legal Assessment for Preparing the Carbon Pricing Instrument for the Philippines"),
+    
+    # Existing project references (these should not be added as new projects)
+    # ("ETP-072-REG-11", "Existing project: Twinning Arrangements for Decarbonization in Southeast Asia"),
+    # ("ETP-061-INO-21", "Existing project: Strengthening Implementation of Government Regulation on Energy Conservation in Indonesia"),
+]))
+
+@lru_cache(maxsize=None)
+def generate_no_id(project_name: str) -> str:
+    """Generate a stable NO-ID identifier for a project without an ID.
+
+    MD5 is kept (rather than a faster non-cryptographic hash) because the
+    resulting IDs are already persisted in map_projectId_projectName.json and
+    shared with recreate_map_projectId_projectName.py.
+    """
+    project_hash = hashlib.md5(project_name.encode()).hexdigest()[:8].upper()
+    return f"NO-ID-{project_hash}"
 
 def parse_new_project_data() -> List[Tuple[str, str]]:
     """Parse the new project data and extract project ID and name pairs"""
     projects = []
     
-    # Define the new projects based on the provided data
-    new_project_entries = [
-        # Projects without IDs (marked with -)
-        (None, "ETP M&E Work"),
-        (None, "Support to NREP"),
-        (None, "Vietnam Energy Transition Expert (QA/QC)"),
-        (None, "PSA TAF coordination support"),
-        (None, "General support to ETP (pooled fund)"),
-        (None, "General support to ETP (EU project)"),
-        (None, "2025 semi-annual report for pooled fund 2024 annual reports for pooled fund and EU"),
-        (None, "QA/QC support to ETP"),
-        (None, "QA/QC support to ETP"),  # Duplicate entry
-        (None, "General support to ETP"),
-        (None, "ETP Dashboards Development and Maintenance"),
-        (None, "-"),  # Empty entry
-        
-        # Projects with ETP IDs
-        ("ETP-041-INO-12", "Supporting JETP Secretariat"),
-        ("ETP-056-INO-18", "Financial Expertise for PT. SMI (Sarana Multi Infrastruktur (Persero), a Special Mission Vehicle under the Ministry of Finance)"),
-        ("ETP-066-PHI-17", "NREP Update"),
-        ("ETP-078-PHI-20", "Streamlining Regulations to Support Energy Transition"),
-        ("ETP-022-PHI-7", "Support to Renewable Energy Procurement Mechanisms (including GEAP)"),
-        ("ETP-037-INO-10", "Integrated Eco-friendly Public Transport"),
-        ("ETP-062-INO-22", "JETP Power System Analysis"),
-        ("ETP-040-PHI-11", "Energy Regulation Development for RE Integration"),
-        ("ETP-050-PHI-14", "Legal Assessment for Preparing the Carbon Pricing Instrument for the Philippines"),
-        
-        # Existing project references (these should not be added as new projects)
-        # ("ETP-072-REG-11", "Existing project: Twinning Arrangements for Decarbonization in Southeast Asia"),
-        # ("ETP-061-INO-21", "Existing project: Strengthening Implementation of Government Regulation on Energy Conservation in Indonesia"),
-    ]
-    
     # Process each project entry
-    for project_id, project_name in new_project_entries:
+    for project_id, project_name in _NEW_PROJECT_ENTRIES:
         if project_name and project_name.strip() != "-":  # Only add if project name exists and is not just a dash
             if not project_id:  # Generate NO-ID for projects without ID
-                project_hash = hashlib.md5(project_name.encode()).hexdigest()[:8].upper()
-                project_id = f"NO-ID-{project_hash}"
+                project_id = generate_no_id(project_name)
             projects.append((project_id, project_name))
     
     return projects
@@ -60,32 +85,17 @@ def determine_project_status(project_id: str, project_name: str) -> str:
     if not project_id:
         return "Unknown"
     
-    # Check for specific patterns in project name
-    if "M&E" in project_name or "Monitoring" in project_name or "Evaluation" in project_name:
-        return "On-going"
-    elif "Support" in project_name or "support" in project_name:
-        return "On-going"
-    elif "Expert" in project_name or "QA/QC" in project_name:
+    # ETP default (cheap prefix test first), or keyword match on the project name
+    if project_id.startswith("ETP-") or _ONGOING_KEYWORDS_RE.search(project_name):
         return "On-going"
-    elif "Development" in project_name or "Maintenance" in project_name:
-        return "On-going"
-    elif "Report" in project_name or "report" in project_name:
-        return "On-going"
-    elif "coordination" in project_name.lower():
-        return "On-going"
-    elif project_id.startswith("ETP-"):
-        return "On-going"  # Default for ETP projects
-    elif project_id.startswith("NO-ID-"):
-        return "Unknown"  # Default for NO-ID projects
-    else:
-        return "Unknown"
+    return "Unknown"  # Default for NO-ID projects
 
 def append_to_map_projectId():
     """Append new projects to the existing map_projectId_projectName.json"""
     
     # Load existing data
-    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'r') as f:
-        existing_data = json.load(f)
+    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'rb') as f:
+        existing_data = orjson.loads(f.read()) if orjson else json.load(f)
     
     print("📊 EXISTING DATA ANALYSIS:")
     print(f"  Current total projects: {existing_data['total_projects']}")
@@ -96,19 +106,19 @@ def append_to_map_projectId():
     print(f"  Found {len(new_projects)} new projects")
     
     # Check for duplicates
-    existing_project_ids = set(existing_data['projects'].keys())
-    existing_project_names = set(project['project_name'] for project in existing_data['projects'].values())
-    
-    duplicates = []
-    new_unique_projects = []
-    
-    for project_id, project_name in new_projects:
-        if project_id in existing_project_ids:
-            duplicates.append(f"ID {project_id}: {project_name[:50]}...")
-        elif project_name in existing_project_names:
-            duplicates.append(f"Name: {project_name[:50]}...")
-        else:
-            new_unique_projects.append((project_id, project_name))
+    existing_projects = existing_data['projects']  # ID membership is tested on the dict itself (O(1), no key copy)
+    existing_project_names = {project['project_name'] for project in existing_projects.values()}
+    
+    duplicates = [
+        f"ID {project_id}: {project_name[:50]}..." if project_id in existing_projects
+        else f"Name: {project_name[:50]}..."
+        for project_id, project_name in new_projects
+        if project_id in existing_projects or project_name in existing_project_names
+    ]
+    new_unique_projects = [
+        (project_id, project_name) for project_id, project_name in new_projects
+        if project_id not in existing_projects and project_name not in existing_project_names
+    ]
     
     if duplicates:
         print(f"\n⚠️  DUPLICATES FOUND ({len(duplicates)}):")
@@ -119,11 +129,15 @@ def append_to_map_projectId():
     
     print(f"\n✅ UNIQUE NEW PROJECTS: {len(new_unique_projects)}")
     
+    # Nothing to append: leave the existing file untouched
+    if not new_unique_projects:
+        print("\nℹ️  No new projects to add, map_projectId_projectName.json left unchanged")
+        return
+    
     # Add new projects to existing data
     for project_id, project_name in new_unique_projects:
         # Clean project name
-        clean_name = project_name.strip()
-        clean_name = re.sub(r'^\[(Completed|Cancelled|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*', '', clean_name)
+        clean_name = _STATUS_PREFIX_RE.sub('', project_name.strip())
         
         status = determine_project_status(project_id, project_name)
         has_original_id = project_id.startswith("ETP-") or project_id.startswith("NO-ID-")
@@ -136,13 +150,18 @@ def append_to_map_projectId():
     
     # Update metadata
     existing_data['total_projects'] = len(existing_data['projects'])
-    existing_data['extraction_date'] = datetime.now().isoformat() + "Z"
-    existing_data['last_updated'] = datetime.now().isoformat() + "Z"
+    now_iso = datetime.now().isoformat() + "Z"
+    existing_data['extraction_date'] = now_iso
+    existing_data['last_updated'] = now_iso
     
     # Save updated data
     output_file = '/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json'
-    with open(output_file, 'w') as f:
-        json.dump(existing_data, f, indent=2)
+    if orjson:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(existing_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(existing_data, f, indent=2)
     
     print(f"\n✅ UPDATED MAP_PROJECTID_PROJECTNAME.JSON")
     print(f"📁 Output saved to: {output_file}")
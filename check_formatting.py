@@ -5,48 +5,57 @@ Script to check Excel formatting in the output file
 import openpyxl
 import sys
 from pathlib import Path
+from openpyxl.utils import get_column_letter
 
-def check_excel_formatting(file_path):
+def check_excel_formatting(file_path, check_dimensions=True):
     """Check the formatting of an Excel file"""
     try:
         print(f"Checking file: {file_path}")
         
-        # Load the Excel file
-        wb = openpyxl.load_workbook(file_path)
+        # Column widths and row heights are only available on a full load;
+        # otherwise use the much cheaper read-only mode
+        wb = openpyxl.load_workbook(file_path, read_only=not check_dimensions)
         
         print(f"Available sheets: {wb.sheetnames}")
         
         if 'RBMF' in wb.sheetnames:
             ws = wb['RBMF']
+            
+            # Read-only sheets without a <dimension> element report no size until scanned
+            if ws.max_column is None:
+                ws.calculate_dimension(force=True)
+            
             print(f"\n=== RBMF Tab Info ===")
             print(f"Total rows: {ws.max_row}")
             print(f"Total columns: {ws.max_column}")
             
+            # Fetch the first two rows (up to 5 columns) in a single range scan
+            rows = list(ws.iter_rows(min_row=1, max_row=2, min_col=1, max_col=min(5, ws.max_column)))
+            
             # Check header row formatting
             print(f"\n=== Header Row (Row 1) Formatting ===")
-            for col in range(1, min(6, ws.max_column + 1)):
-                cell = ws.cell(row=1, column=col)
+            for col, cell in enumerate(rows[0] if rows else (), start=1):
                 font_size = cell.font.size if cell.font else "None"
                 wrap_text = cell.alignment.wrap_text if cell.alignment else "None"
                 print(f"Column {col}: Font size = {font_size}, Wrap text = {wrap_text}")
             
-            # Check column widths
-            print(f"\n=== Column Widths ===")
-            for col in range(1, min(6, ws.max_column + 1)):
-                col_letter = openpyxl.utils.get_column_letter(col)
-                width = ws.column_dimensions[col_letter].width
-                print(f"Column {col_letter}: {width}")
-            
-            # Check row heights
-            print(f"\n=== Row Heights (first 5 rows) ===")
-            for row in range(1, min(6, ws.max_row + 1)):
-                height = ws.row_dimensions[row].height
-                print(f"Row {row}: {height}")
+            if check_dimensions:
+                # Check column widths
+                print(f"\n=== Column Widths ===")
+                for col in range(1, min(6, ws.max_column + 1)):
+                    col_letter = get_column_letter(col)
+                    width = ws.column_dimensions[col_letter].width
+                    print(f"Column {col_letter}: {width}")
+                
+                # Check row heights
+                print(f"\n=== Row Heights (first 5 rows) ===")
+                for row in range(1, min(6, ws.max_row + 1)):
+                    height = ws.row_dimensions[row].height
+                    print(f"Row {row}: {height}")
             
             # Check data cell formatting
             print(f"\n=== Data Cell Formatting (Row 2) ===")
-            for col in range(1, min(6, ws.max_column + 1)):
-                cell = ws.cell(row=2, column=col)
+            for col, cell in enumerate(rows[1] if len(rows) > 1 else (), start=1):
                 font_size = cell.font.size if cell.font else "None"
                 wrap_text = cell.alignment.wrap_text if cell.alignment else "None"
                 print(f"Column {col}: Font size = {font_size}, Wrap text = {wrap_text}")
@@ -70,5 +79,5 @@ if __name__ == "__main__":
         print(f"File not found: {file_path}")
         sys.exit(1)
     
-    success = check_excel_formatting(file_path)
+    success = check_excel_formatting(file_path, check_dimensions="--no-dimensions" not in sys.argv[1:])
     sys.exit(0 if success else 1)
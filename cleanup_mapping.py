@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Clean up map_projectId_projectName.json by removing added projects
+
+Loads the mapping once, applies the selected cleanups in the order given on
+the command line and writes the result once.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+MAPPING_FILE = Path("data/2025-output/map_projectId_projectName.json")
+ORIGINAL_EXTRACTION_DATE = "2025-09-05T04:20:00Z"
+
+# Projects that were added on top of the original 117
+ADDED_PROJECT_IDS = frozenset([
+    "22393-001", "22393-002"
+])
+ADDED_NO_ID_PROJECTS = frozenset([
+    'NO-ID-7170A0B2', 'NO-ID-1EBF278C', 'NO-ID-BD3723F3', 'NO-ID-8C3E04FC',
+    'NO-ID-79C54BE5', 'NO-ID-CAA7B099', 'NO-ID-AFBB9A63', 'NO-ID-ADC0B111',
+    'NO-ID-477D2DF8',
+])
+
+def load_mapping(mapping_file=MAPPING_FILE):
+    """Load the project mapping JSON."""
+    with open(mapping_file, 'rb') as f:
+        return orjson.loads(f.read()) if orjson else json.load(f)
+
+def save_mapping(data, mapping_file=MAPPING_FILE):
+    """Write the project mapping JSON."""
+    if orjson:
+        with open(mapping_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(mapping_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def remove_added(projects):
+    """Drop the added 22393 projects and NO-ID projects added for entries with "-"."""
+    # NO-ID projects added for entries with "-" have "has_original_id": true
+    return {
+        project_id: project_info
+        for project_id, project_info in projects.items()
+        if not (project_id in ADDED_PROJECT_IDS
+                or (project_id.startswith('NO-ID-') and project_info.get('has_original_id', False)))
+    }
+
+def restore_original(projects):
+    """Keep only ETP projects and the original NO-ID projects."""
+    # Original NO-ID projects have "has_original_id": false
+    return {
+        project_id: project_info
+        for project_id, project_info in projects.items()
+        if project_id.startswith('ETP-')
+        or (project_id.startswith('NO-ID-') and not project_info.get('has_original_id', False))
+    }
+
+def revert_added(projects):
+    """Drop the 22393 projects and the listed NO-ID projects that were added."""
+    return {
+        project_id: project_info
+        for project_id, project_info in projects.items()
+        if not (project_id.startswith('22393-') or project_id in ADDED_NO_ID_PROJECTS)
+    }
+
+CLEANUPS = {
+    'remove': remove_added,
+    'restore': restore_original,
+    'revert': revert_added,
+}
+
+def cleanup_mapping(cleanups, mapping_file=MAPPING_FILE):
+    """Apply the named cleanups in sequence with a single load and write."""
+    data = load_mapping(mapping_file)
+
+    projects = data['projects']
+    for name in cleanups:
+        projects = CLEANUPS[name](projects)
+
+    # Update metadata
+    data['projects'] = projects
+    data['total_projects'] = len(projects)
+    data['extraction_date'] = ORIGINAL_EXTRACTION_DATE
+
+    save_mapping(data, mapping_file)
+    return data
+
+def print_project_counts(projects):
+    """Print the number of ETP and NO-ID projects."""
+    etp_count = sum(1 for pid in projects if pid.startswith('ETP-'))
+    noid_count = sum(1 for pid in projects if pid.startswith('NO-ID-'))
+    print(f"ETP projects: {etp_count}")
+    print(f"NO-ID projects: {noid_count}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--remove', dest='cleanups', action='append_const', const='remove',
+                        help='remove the 22393 projects and NO-ID projects added for "-" entries')
+    parser.add_argument('--restore', dest='cleanups', action='append_const', const='restore',
+                        help='keep only ETP projects and the original NO-ID projects')
+    parser.add_argument('--revert', dest='cleanups', action='append_const', const='revert',
+                        help='remove the 22393 projects and the listed added NO-ID projects')
+    parser.add_argument('--mapping-file', type=Path, default=MAPPING_FILE,
+                        help='mapping JSON to clean up in place')
+    args = parser.parse_args()
+
+    if not args.cleanups:
+        parser.error('select at least one of --remove, --restore, --revert')
+
+    data = cleanup_mapping(args.cleanups, args.mapping_file)
+
+    print(f"Cleaned up {args.mapping_file.name} ({', '.join(args.cleanups)})")
+    print(f"Now has {len(data['projects'])} projects")
+    print_project_counts(data['projects'])
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,107 @@ Complete Solution for Mapping All 5 Tables in Overview Tab
 From Original RBMF File to 2025 Template
 """
 
+import numpy as np
+import openpyxl
 import pandas as pd
-import re
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Tuple, Optional
+
+# Cell copies from original to template per table, as (template_row, template_col, original_row, original_col)
+TABLE_COPY_PLANS = {
+    # TABLE 1: General Overview Section (Left Side) - template rows 0-7, original rows 0-7
+    1: [
+        (0, 0, 0, 0),  # "General Overview"
+        (1, 1, 2, 1),  # Country, e.g. "Indonesia"
+        (2, 1, 3, 1),  # Full project name
+        (4, 1, 1, 1),  # Implementing partner, e.g. "Aquatera"
+    ],
+    
+    # TABLE 2: Project Overview Section (Right Side) - template rows 0-7, original rows 0-7
+    2: [
+        (0, 4, 0, 4),  # "Project overview"
+        (1, 5, 1, 5),  # Primary strategic outcome, e.g. "SO4 - Knowledge and Awareness Building"
+        (2, 5, 2, 5),  # Impact description
+        (3, 5, 3, 5),  # Outcome description
+        (4, 5, 4, 5),  # Output description
+    ],
+    
+    # TABLE 3: Implementation Partner Overview Table - template rows 8-12, original rows 7-12
+    3: [
+        (8, 0, 7, 0),  # "Implementation Partner Overview"
+        (9, 0, 8, 0), (9, 1, 8, 1), (9, 2, 8, 2),  # Table header: "Implementation Partner", "Total", "Female"
+        (10, 0, 9, 0), (10, 1, 9, 1), (10, 2, 9, 2),  # "Project Team"
+        (11, 0, 10, 0), (11, 1, 10, 1), (11, 2, 10, 2),  # "Number of Founders"
+        (12, 0, 11, 0), (12, 1, 11, 1), (12, 2, 11, 2),  # "Senior Management"
+    ],
+    
+    # TABLE 4: Project Stakeholders Table - template rows 14-15, original rows 13-14
+    4: [
+        (14, 0, 13, 0),  # "Project Stakeholders"
+        (14, 4, 13, 4),  # "Project Stakeholders/Beneficiary Quotes"
+        (15, 0, 14, 0), (15, 1, 14, 1), (15, 2, 14, 2),  # "Stakeholder Name", "Department/Organisation Name", "Position"
+        (15, 4, 14, 4), (15, 5, 14, 5), (15, 6, 14, 6), (15, 7, 14, 7),  # "Stakeholder/Beneficiary Name", ..., "Quote"
+    ],
+    
+    # TABLE 5: Project Stakeholders/Beneficiary Quotes Table - template rows 16+, original rows 15-20
+    5: [
+        (16 + offset, dst_col, 15 + offset, src_col)
+        for offset in range(6)
+        for dst_col, src_col in ((4, 0), (5, 1), (6, 2), (7, 7))  # Name, Department, Position, Quote
+    ],
+}
+
+# Tables whose rows may be missing from the original (there may be fewer than 6 stakeholder quotes)
+OPTIONAL_TABLES = frozenset([5])
+
+# Fixed labels written into the template per table, as (template_row, template_col, value)
+TABLE_LABELS = {
+    1: [
+        (1, 0, "Country"),
+        (2, 0, "Project Name"),
+        (3, 0, "Project ID"),
+        (3, 1, ""),  # Not present in original
+        (4, 0, "Implementing Partner/Retainer Name"),
+        (5, 0, "Implementation period"),
+        (6, 0, "Post Implementation Monitoring"),
+        (6, 1, ""),  # Not present in original
+    ],
+    2: [
+        (1, 4, "Primary strategic outcome"),
+        (2, 4, "Impact"),
+        (3, 4, "Outcome"),
+        (4, 4, "Output"),
+    ],
+}
+
+def split_implementation_period(period) -> Optional[Tuple[str, str]]:
+    """
+    Split an implementation period such as "July 2024 - November 2025" into (from, to)
+    """
+    if ' - ' in period:
+        from_date, to_date = period.split(' - ')
+        return from_date.strip(), to_date.strip()
+    return None
+
+def read_overview_cells(file_path: str, max_row: Optional[int] = None) -> np.ndarray:
+    """
+    Read Overview sheet values into a 2D object array (empty cells are None)
+    """
+    # Pass a file handle so extensionless source files are accepted
+    with open(file_path, 'rb') as f:
+        wb = openpyxl.load_workbook(f, read_only=True, data_only=True)
+        try:
+            rows = list(wb['Overview'].iter_rows(max_row=max_row, values_only=True))
+        finally:
+            wb.close()
+    
+    # Drop trailing empty rows, as pd.read_excel does
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    
+    cells = np.full((len(rows), max((len(row) for row in rows), default=0)), None, dtype=object)
+    for r, row in enumerate(rows):
+        cells[r, :len(row)] = row
+    return cells
 
 class OverviewTableMapper:
     """
@@ -13,173 +111,108 @@ class OverviewTableMapper:
     """
     
     def __init__(self):
-        self.mapping_results = {}
+        # Split the copy plans into index arrays for a single gather/scatter
+        copies = [(*cell, table in OPTIONAL_TABLES) for table, plan in TABLE_COPY_PLANS.items() for cell in plan]
+        plan = np.array(copies, dtype=np.intp)
+        self.plan_dst_r, self.plan_dst_c, self.plan_src_r, self.plan_src_c = plan[:, :4].T
+        self.plan_optional = plan[:, 4].astype(bool)
+        
+        label_rows, label_cols, label_values = zip(*(label for labels in TABLE_LABELS.values() for label in labels))
+        self.label_r = np.array(label_rows, dtype=np.intp)
+        self.label_c = np.array(label_cols, dtype=np.intp)
+        self.label_values = np.array(label_values, dtype=object)
     
     def map_all_tables(self, original_file_path: str, template_file_path: str, output_file_path: str):
         """
         Map all 5 tables from original to template
         """
-        # Read both files
-        df_original = pd.read_excel(original_file_path, sheet_name='Overview', header=None)
-        df_template = pd.read_excel(template_file_path, sheet_name='Overview', header=None)
+        # Read both files; only the first rows of the original are mapped
+        src = read_overview_cells(original_file_path, max_row=int(self.plan_src_r.max()) + 1)
+        # The freshly read template array is owned here, so it is filled in place (no template copy)
+        out = read_overview_cells(template_file_path)
         
-        # Create output dataframe
-        df_output = df_template.copy()
+        # Only stakeholder quote rows may be missing from the original; tables 1-4 need all of theirs
+        present = self.plan_src_r < src.shape[0]
+        missing = ~present & ~self.plan_optional
+        if missing.any():
+            raise IndexError(
+                f"Overview sheet of {original_file_path} has {src.shape[0]} rows, "
+                f"but tables 1-4 need {int(self.plan_src_r[missing].max()) + 1}"
+            )
         
         # Map all 5 tables
-        self.map_table_1_general_overview(df_original, df_output)
-        self.map_table_2_project_overview(df_original, df_output)
-        self.map_table_3_implementation_partner(df_original, df_output)
-        self.map_table_4_project_stakeholders(df_original, df_output)
-        self.map_table_5_stakeholder_quotes(df_original, df_output)
+        print("Mapping Tables 1-5: Overview tab")
+        out[self.label_r, self.label_c] = self.label_values
+        out[self.plan_dst_r[present], self.plan_dst_c[present]] = src[self.plan_src_r[present], self.plan_src_c[present]]
+        
+        # Row 5: Implementation period, e.g. "July 2024 - November 2025"
+        period = split_implementation_period(src[5, 1])
+        if period:
+            out[5, 1], out[5, 2] = period
+        
+        print(f"✓ {int(present.sum()) + len(self.label_values)} cells mapped successfully")
         
-        # Save result
-        with pd.ExcelWriter(output_file_path, engine='openpyxl') as writer:
-            df_output.to_excel(writer, sheet_name='Overview', index=False, header=False)
+        # Save result, streaming rows with openpyxl's write-only mode
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Overview')
+        for row in out.tolist():
+            ws.append(row)
+        wb.save(output_file_path)
         
-        return df_output
+        return pd.DataFrame(out, copy=False)
     
     def map_table_1_general_overview(self, df_original: pd.DataFrame, df_output: pd.DataFrame):
         """
         TABLE 1: General Overview Section (Left Side)
         Template rows 0-7, Original rows 0-7
         """
-        print("Mapping Table 1: General Overview Section")
-        
-        # Row 0: Section header
-        df_output.iloc[0, 0] = df_original.iloc[0, 0]  # "General Overview"
-        
-        # Row 1: Country
-        df_output.iloc[1, 0] = "Country"
-        df_output.iloc[1, 1] = df_original.iloc[2, 1]  # "Indonesia"
-        
-        # Row 2: Project Name
-        df_output.iloc[2, 0] = "Project Name"
-        df_output.iloc[2, 1] = df_original.iloc[3, 1]  # Full project name
-        
-        # Row 3: Project ID
-        df_output.iloc[3, 0] = "Project ID"
-        df_output.iloc[3, 1] = ""  # Not present in original
-        
-        # Row 4: Implementing Partner
-        df_output.iloc[4, 0] = "Implementing Partner/Retainer Name"
-        df_output.iloc[4, 1] = df_original.iloc[1, 1]  # "Aquatera"
+        self._map_table(1, df_original, df_output)
         
         # Row 5: Implementation period
-        df_output.iloc[5, 0] = "Implementation period"
-        period = df_original.iloc[5, 1]  # "July 2024 - November 2025"
-        if ' - ' in period:
-            from_date, to_date = period.split(' - ')
-            df_output.iloc[5, 1] = from_date.strip()
-            df_output.iloc[5, 2] = to_date.strip()
-        
-        # Row 6: Post Implementation Monitoring
-        df_output.iloc[6, 0] = "Post Implementation Monitoring"
-        df_output.iloc[6, 1] = ""  # Not present in original
-        
-        print("✓ Table 1 mapped successfully")
+        period = split_implementation_period(df_original.iloc[5, 1])
+        if period:
+            df_output.iloc[5, 1], df_output.iloc[5, 2] = period
     
     def map_table_2_project_overview(self, df_original: pd.DataFrame, df_output: pd.DataFrame):
         """
         TABLE 2: Project Overview Section (Right Side)
         Template rows 0-7, Original rows 0-7 (right side columns)
         """
-        print("Mapping Table 2: Project Overview Section")
-        
-        # Row 0: Section header
-        df_output.iloc[0, 4] = df_original.iloc[0, 4]  # "Project overview"
-        
-        # Row 1: Primary strategic outcome
-        df_output.iloc[1, 4] = "Primary strategic outcome"
-        df_output.iloc[1, 5] = df_original.iloc[1, 5]  # "SO4 - Knowledge and Awareness Building"
-        
-        # Row 2: Impact
-        df_output.iloc[2, 4] = "Impact"
-        df_output.iloc[2, 5] = df_original.iloc[2, 5]  # Impact description
-        
-        # Row 3: Outcome
-        df_output.iloc[3, 4] = "Outcome"
-        df_output.iloc[3, 5] = df_original.iloc[3, 5]  # Outcome description
-        
-        # Row 4: Output
-        df_output.iloc[4, 4] = "Output"
-        df_output.iloc[4, 5] = df_original.iloc[4, 5]  # Output description
-        
-        print("✓ Table 2 mapped successfully")
+        self._map_table(2, df_original, df_output)
     
     def map_table_3_implementation_partner(self, df_original: pd.DataFrame, df_output: pd.DataFrame):
         """
         TABLE 3: Implementation Partner Overview Table
         Template rows 8-12, Original rows 7-12
         """
-        print("Mapping Table 3: Implementation Partner Overview Table")
-        
-        # Row 8: Section header
-        df_output.iloc[8, 0] = df_original.iloc[7, 0]  # "Implementation Partner Overview"
-        
-        # Row 9: Table header
-        df_output.iloc[9, 0] = df_original.iloc[8, 0]  # "Implementation Partner"
-        df_output.iloc[9, 1] = df_original.iloc[8, 1]  # "Total"
-        df_output.iloc[9, 2] = df_original.iloc[8, 2]  # "Female"
-        
-        # Row 10: Project Team
-        df_output.iloc[10, 0] = df_original.iloc[9, 0]  # "Project Team"
-        df_output.iloc[10, 1] = df_original.iloc[9, 1]  # "17"
-        df_output.iloc[10, 2] = df_original.iloc[9, 2]  # "9"
-        
-        # Row 11: Number of Founders
-        df_output.iloc[11, 0] = df_original.iloc[10, 0]  # "Number of Founders"
-        df_output.iloc[11, 1] = df_original.iloc[10, 1]  # "1"
-        df_output.iloc[11, 2] = df_original.iloc[10, 2]  # "0"
-        
-        # Row 12: Senior Management
-        df_output.iloc[12, 0] = df_original.iloc[11, 0]  # "Senior Management"
-        df_output.iloc[12, 1] = df_original.iloc[11, 1]  # "5 Directors"
-        df_output.iloc[12, 2] = df_original.iloc[11, 2]  # "2"
-        
-        print("✓ Table 3 mapped successfully")
+        self._map_table(3, df_original, df_output)
     
     def map_table_4_project_stakeholders(self, df_original: pd.DataFrame, df_output: pd.DataFrame):
         """
         TABLE 4: Project Stakeholders Table
         Template rows 14-15, Original rows 13-14
         """
-        print("Mapping Table 4: Project Stakeholders Table")
-        
-        # Row 14: Section header
-        df_output.iloc[14, 0] = df_original.iloc[13, 0]  # "Project Stakeholders"
-        df_output.iloc[14, 4] = df_original.iloc[13, 4]  # "Project Stakeholders/Beneficiary Quotes"
-        
-        # Row 15: Table header
-        df_output.iloc[15, 0] = df_original.iloc[14, 0]  # "Stakeholder Name"
-        df_output.iloc[15, 1] = df_original.iloc[14, 1]  # "Department/Organisation Name"
-        df_output.iloc[15, 2] = df_original.iloc[14, 2]  # "Position"
-        df_output.iloc[15, 4] = df_original.iloc[14, 4]  # "Stakeholder/Beneficiary Name"
-        df_output.iloc[15, 5] = df_original.iloc[14, 5]  # "Department/Organisation Name"
-        df_output.iloc[15, 6] = df_original.iloc[14, 6]  # "Position"
-        df_output.iloc[15, 7] = df_original.iloc[14, 7]  # "Quote"
-        
-        print("✓ Table 4 mapped successfully")
+        self._map_table(4, df_original, df_output)
     
     def map_table_5_stakeholder_quotes(self, df_original: pd.DataFrame, df_output: pd.DataFrame):
         """
         TABLE 5: Project Stakeholders/Beneficiary Quotes Table
         Template rows 16+, Original rows 15-20
         """
-        print("Mapping Table 5: Project Stakeholders/Beneficiary Quotes Table")
-        
-        # Copy stakeholder data rows
-        template_row = 16
-        for orig_row in range(15, 21):  # Rows 15-20 in original
-            if orig_row < len(df_original):
-                # Copy stakeholder data to template right side
-                df_output.iloc[template_row, 4] = df_original.iloc[orig_row, 0]  # Name
-                df_output.iloc[template_row, 5] = df_original.iloc[orig_row, 1]  # Department
-                df_output.iloc[template_row, 6] = df_original.iloc[orig_row, 2]  # Position
-                df_output.iloc[template_row, 7] = df_original.iloc[orig_row, 7]  # Quote (empty)
-                template_row += 1
-        
-        print("✓ Table 5 mapped successfully")
+        self._map_table(5, df_original, df_output)
+    
+    def _map_table(self, table: int, df_original: pd.DataFrame, df_output: pd.DataFrame):
+        """
+        Write one table's labels and copied cells into df_output
+        """
+        print(f"Mapping Table {table}")
+        for row, col, value in TABLE_LABELS.get(table, ()):
+            df_output.iloc[row, col] = value
+        for dst_row, dst_col, src_row, src_col in TABLE_COPY_PLANS[table]:
+            if table in OPTIONAL_TABLES and src_row >= len(df_original):
+                continue  # Stakeholder quote row not present in the original
+            df_output.iloc[dst_row, dst_col] = df_original.iloc[src_row, src_col]
+        print(f"✓ Table {table} mapped successfully")
     
     def get_mapping_summary(self) -> Dict:
         """
@@ -4,12 +4,23 @@ Improved script to recreate file_to_projectId_mapping.json using better project
 and fuzzy matching with the updated map_projectId_projectName.json
 """
 
+import argparse
 import json
 import re
-from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from project_matching import (PreparedName, add_workers_argument, build_key_term_index, calculate_prepared_similarity,
+                              find_best_fuzzy_match, map_in_workers, prepare_clean_name,
+                              prepare_project_mappings, worker_projects, write_mapping)
+
+# Patterns used when cleaning and comparing project names
+_STATUS_PREFIX_RE = re.compile(r'^\[(Completed|Cancelled|New|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-\(\)]')  # Everything except word chars, whitespace, hyphens and parentheses
+
+@lru_cache(maxsize=None)
 def extract_project_name_from_filename(filename: str) -> str:
     """Extract project name from filename using the specified logic"""
     # Split by "_" and get the last part
@@ -31,75 +42,57 @@ def extract_project_name_from_filename(filename: str) -> str:
     
     return last_part.strip()
 
+@lru_cache(maxsize=None)
 def clean_project_name(name: str) -> str:
     """Clean project name for better matching"""
     # Remove common prefixes and suffixes
-    name = re.sub(r'^\[(Completed|Cancelled|New|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*', '', name)
+    name = _STATUS_PREFIX_RE.sub('', name)
     
     # Normalize whitespace and special characters
-    name = re.sub(r'\s+', ' ', name.strip())
-    name = re.sub(r'[^\w\s\-\(\)]', '', name)  # Remove special chars except hyphens and parentheses
+    name = _WHITESPACE_RE.sub(' ', name.strip())
+    name = _SPECIAL_CHARS_RE.sub('', name)  # Remove special chars except hyphens and parentheses
     
     return name.lower()
 
+def prepare_name(name: str) -> PreparedName:
+    """Clean and tokenize a name once so it can be compared many times"""
+    return prepare_clean_name(clean_project_name(name))
+
 def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity between two strings using multiple methods"""
-    # Clean both strings
-    clean1 = clean_project_name(str1)
-    clean2 = clean_project_name(str2)
-    
-    # Method 1: SequenceMatcher similarity
-    seq_similarity = SequenceMatcher(None, clean1, clean2).ratio()
-    
-    # Method 2: Check if one is contained in the other (substring match)
-    substring_similarity = 0.0
-    if clean1 in clean2 or clean2 in clean1:
-        substring_similarity = min(len(clean1), len(clean2)) / max(len(clean1), len(clean2))
-    
-    # Method 3: Word overlap similarity
-    words1 = set(clean1.split())
-    words2 = set(clean2.split())
-    if words1 and words2:
-        word_overlap = len(words1.intersection(words2)) / len(words1.union(words2))
-    else:
-        word_overlap = 0.0
-    
-    # Method 4: Check for key terms match
-    key_terms1 = set(re.findall(r'\b\w{4,}\b', clean1))  # Words with 4+ characters
-    key_terms2 = set(re.findall(r'\b\w{4,}\b', clean2))
-    if key_terms1 and key_terms2:
-        key_terms_similarity = len(key_terms1.intersection(key_terms2)) / len(key_terms1.union(key_terms2))
-    else:
-        key_terms_similarity = 0.0
-    
-    # Weighted combination of all methods
-    final_similarity = (
-        seq_similarity * 0.3 +
-        substring_similarity * 0.3 +
-        word_overlap * 0.2 +
-        key_terms_similarity * 0.2
-    )
-    
-    return final_similarity
+    return calculate_prepared_similarity(prepare_name(str1), prepare_name(str2))
 
-def find_best_match(file_name: str, project_mappings: Dict[str, Dict]) -> Tuple[Optional[str], float, str]:
-    """Find the best matching project ID for a given file name"""
+def find_best_match(file_name: str, prepared_projects: List[Tuple[str, PreparedName]],
+                    key_term_index: Optional[Dict[str, List[int]]] = None,
+                    match_cache: Optional[Dict[str, Tuple[Optional[str], float, str]]] = None
+                    ) -> Tuple[Optional[str], float, str]:
+    """Find the best matching project ID for a given file name
+    
+    match_cache maps cleaned extracted names to earlier results for the same prepared_projects.
+    """
     
-    # Extract project name from filename
+    # Extract and prepare project name from filename
     extracted_project_name = extract_project_name_from_filename(file_name)
+    prepared_extracted = prepare_name(extracted_project_name)
+    clean_extracted = prepared_extracted.clean
     
-    best_match_id = None
-    best_similarity = 0.0
-    match_type = "none"
+    # The result only depends on the cleaned name, so repeated names are answered from the cache
+    if match_cache is not None:
+        cached = match_cache.get(clean_extracted)
+        if cached is None:
+            cached = match_cache[clean_extracted] = _find_best_match(prepared_extracted, prepared_projects,
+                                                                     key_term_index)
+        return cached
+    return _find_best_match(prepared_extracted, prepared_projects, key_term_index)
+
+def _find_best_match(prepared_extracted: PreparedName, prepared_projects: List[Tuple[str, PreparedName]],
+                     key_term_index: Optional[Dict[str, List[int]]]) -> Tuple[Optional[str], float, str]:
+    """find_best_match() for an already prepared extracted name"""
+    clean_extracted = prepared_extracted.clean
     
     # First try exact matching
-    for project_id, project_data in project_mappings.items():
-        project_name = project_data.get('project_name', '')
-        
-        # Clean both names for exact comparison
-        clean_extracted = clean_project_name(extracted_project_name)
-        clean_project = clean_project_name(project_name)
-        
+    for project_id, prepared_project in prepared_projects:
+        clean_project = prepared_project.clean
         if clean_extracted == clean_project:
             return project_id, 1.0, "exact"
         
@@ -109,29 +102,76 @@ def find_best_match(file_name: str, project_mappings: Dict[str, Dict]) -> Tuple[
                 return project_id, 0.95, "exact_substring"
     
     # If no exact match, try fuzzy matching
-    for project_id, project_data in project_mappings.items():
-        project_name = project_data.get('project_name', '')
-        similarity = calculate_similarity(extracted_project_name, project_name)
-        
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match_id = project_id
-            match_type = "fuzzy"
+    best_match_id, best_similarity = find_best_fuzzy_match(prepared_extracted, prepared_projects, key_term_index)
+    match_type = "fuzzy" if best_match_id is not None else "none"
     
     return best_match_id, best_similarity, match_type
 
-def create_improved_mapping(threshold: float = 0.6) -> Dict:
-    """Create improved file_to_projectId_mapping.json using better project name extraction"""
+def match_folder(folder_name: str, folder_projects: List[str], prepared_projects: List[Tuple[str, PreparedName]],
+                 key_term_index: Dict[str, List[int]], threshold: float,
+                 match_cache: Optional[Dict[str, Tuple[Optional[str], float, str]]] = None) -> Dict:
+    """Match every file of one folder and return the folder's result entry"""
+    folder_matches = {}
+    folder_unmatched = []
+    folder_exact = 0
+    folder_fuzzy = 0
+    
+    for file_name in folder_projects:
+        # Extract project name and find best match
+        best_match_id, similarity, match_type = find_best_match(file_name, prepared_projects, key_term_index, match_cache)
+        
+        if match_type == "exact" or match_type == "exact_substring":
+            folder_matches[file_name] = best_match_id
+            folder_exact += 1
+        elif similarity >= threshold and best_match_id:
+            folder_matches[file_name] = best_match_id
+            folder_fuzzy += 1
+        else:
+            folder_unmatched.append(file_name)
+    
+    return {
+        "folder_name": folder_name,
+        "total_files": len(folder_projects),
+        "matched_files": len(folder_matches),
+        "exact_matches": folder_exact,
+        "fuzzy_matches": folder_fuzzy,
+        "unmatched_files": len(folder_unmatched),
+        "mappings": folder_matches,
+        "unmatched_list": folder_unmatched
+    }
+
+def _load_orjson():
+    """Import orjson when the data files are read (None falls back to json)"""
+    try:
+        import orjson
+    except ImportError:  # Fall back to the standard library json module
+        return None
+    return orjson
+
+def _match_folder_in_worker(folder_name: str, folder_projects: List[str], threshold: float) -> Dict:
+    """match_folder() using the worker's prepared projects"""
+    return match_folder(folder_name, folder_projects, worker_projects['prepared_projects'],
+                        worker_projects['key_term_index'], threshold, worker_projects['match_cache'])
+
+def create_improved_mapping(threshold: float = 0.6, max_workers: Optional[int] = 1) -> Dict:
+    """Create improved file_to_projectId_mapping.json using better project name extraction
+    
+    Folders are matched in-process when max_workers is 1, otherwise across a process pool
+    (None uses one worker per CPU).
+    """
+    orjson = _load_orjson()
     
     # Load the data files
-    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/project_names.json', 'r') as f:
-        project_names_data = json.load(f)
+    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/project_names.json', 'rb') as f:
+        project_names_data = orjson.loads(f.read()) if orjson else json.load(f)
     
-    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'r') as f:
-        project_mappings_data = json.load(f)
+    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'rb') as f:
+        project_mappings_data = orjson.loads(f.read()) if orjson else json.load(f)
     
-    # Extract project mappings
+    # Extract project mappings, preparing each project name once up front
     project_mappings = project_mappings_data.get('projects', {})
+    prepared_projects = prepare_project_mappings(project_mappings, prepare_name)
+    key_term_index = build_key_term_index(prepared_projects)
     
     # Initialize result structure
     result = {
@@ -147,55 +187,42 @@ def create_improved_mapping(threshold: float = 0.6) -> Dict:
         "unmatched_files": []
     }
     
+    # Process each folder (independent of each other, so they can run in parallel)
+    folders = [
+        (folder_name, folder_data.get('projects', []))
+        for folder_name, folder_data in project_names_data.get('folders', {}).items()
+    ]
+    if max_workers == 1:
+        match_cache = {}  # File names repeat across folders
+        folder_results = [
+            match_folder(folder_name, folder_projects, prepared_projects, key_term_index, threshold, match_cache)
+            for folder_name, folder_projects in folders
+        ]
+    else:
+        folder_results = map_in_workers(
+            _match_folder_in_worker, max_workers, prepared_projects, key_term_index,
+            [folder_name for folder_name, _ in folders],
+            [folder_projects for _, folder_projects in folders],
+            [threshold] * len(folders),
+        )
+    
     total_files = 0
-    total_matches = 0
     exact_matches = 0
     fuzzy_matches = 0
     all_unmatched = []
     
-    # Process each folder
-    for folder_name, folder_data in project_names_data.get('folders', {}).items():
-        folder_projects = folder_data.get('projects', [])
-        folder_matches = {}
-        folder_unmatched = []
-        folder_exact = 0
-        folder_fuzzy = 0
-        
-        for file_name in folder_projects:
-            total_files += 1
-            
-            # Extract project name and find best match
-            best_match_id, similarity, match_type = find_best_match(file_name, project_mappings)
-            
-            if match_type == "exact" or match_type == "exact_substring":
-                folder_matches[file_name] = best_match_id
-                total_matches += 1
-                exact_matches += 1
-                folder_exact += 1
-            elif similarity >= threshold and best_match_id:
-                folder_matches[file_name] = best_match_id
-                total_matches += 1
-                fuzzy_matches += 1
-                folder_fuzzy += 1
-            else:
-                folder_unmatched.append(file_name)
-                all_unmatched.append(f"{folder_name}: {file_name}")
-        
-        # Store folder results
-        result["folders"][folder_name] = {
-            "folder_name": folder_name,
-            "total_files": len(folder_projects),
-            "matched_files": len(folder_matches),
-            "exact_matches": folder_exact,
-            "fuzzy_matches": folder_fuzzy,
-            "unmatched_files": len(folder_unmatched),
-            "mappings": folder_matches,
-            "unmatched_list": folder_unmatched
-        }
+    # Store folder results
+    for folder_result in folder_results:
+        folder_name = folder_result["folder_name"]
+        result["folders"][folder_name] = folder_result
+        total_files += folder_result["total_files"]
+        exact_matches += folder_result["exact_matches"]
+        fuzzy_matches += folder_result["fuzzy_matches"]
+        all_unmatched.extend(f"{folder_name}: {file_name}" for file_name in folder_result["unmatched_list"])
     
     # Update summary statistics
     result["total_files_processed"] = total_files
-    result["total_matches_found"] = total_matches
+    result["total_matches_found"] = exact_matches + fuzzy_matches
     result["exact_matches"] = exact_matches
     result["fuzzy_matches"] = fuzzy_matches
     result["unmatched_count"] = len(all_unmatched)
@@ -205,17 +232,20 @@ def create_improved_mapping(threshold: float = 0.6) -> Dict:
 
 def main():
     """Main function to create improved mapping file"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_workers_argument(parser)
+    args = parser.parse_args()
+    
     print("🔄 Creating improved file_to_projectId_mapping.json...")
     print("Using project name extraction: last part after splitting by '_'")
     print("Matching strategy: exact matches first, then fuzzy matching (60% threshold)")
     
-    # Create improved mapping
-    result = create_improved_mapping(0.6)
+    # Create improved mapping (--workers other than 1 matches folders in parallel processes)
+    result = create_improved_mapping(0.6, max_workers=args.workers)
     
     # Save the result
     output_file = '/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/file_to_projectId_mapping.json'
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    write_mapping(output_file, result)
     
     print(f"\n✅ Created improved mapping file")
     print(f"📁 Output saved to: {output_file}")
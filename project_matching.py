@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Fuzzy matching of names against project names, shared by improved_mapping.py and recreate_mapping.py
+
+Each script cleans names its own way; everything from the cleaned name onwards is common.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, FrozenSet, List, NamedTuple, Tuple, Optional
+
+_KEY_TERM_RE = re.compile(r'\b\w{4,}\b')  # Words with 4+ characters
+
+class PreparedName(NamedTuple):
+    """A cleaned name together with its word and key-term sets"""
+    clean: str
+    words: FrozenSet[str]
+    key_terms: FrozenSet[str]
+
+def prepare_clean_name(clean: str) -> PreparedName:
+    """Tokenize an already cleaned name once so it can be compared many times"""
+    return PreparedName(clean, frozenset(clean.split()), frozenset(_KEY_TERM_RE.findall(clean)))
+
+def calculate_prepared_similarity(prep1: PreparedName, prep2: PreparedName,
+                                  score_cutoff: Optional[float] = None) -> float:
+    """Calculate similarity between two prepared names using multiple methods
+
+    If score_cutoff is given, 0.0 may be returned for pairs that cannot score above it.
+    """
+    clean1, words1, key_terms1 = prep1
+    clean2, words2, key_terms2 = prep2
+
+    # Skip pairs whose length/set-size bound already rules them out (small margin for float rounding)
+    if score_cutoff is not None and similarity_upper_bound(prep1, prep2) + 1e-9 <= score_cutoff:
+        return 0.0
+
+    # Method 2: Check if one is contained in the other (substring match)
+    substring_similarity = 0.0
+    if clean1 in clean2 or clean2 in clean1:
+        substring_similarity = min(len(clean1), len(clean2)) / max(len(clean1), len(clean2))
+
+    # Method 3: Word overlap similarity
+    word_overlap = _jaccard(words1, words2)
+
+    # Method 4: Check for key terms match
+    key_terms_similarity = _jaccard(key_terms1, key_terms2)
+
+    # The cheap metrics are known now; only run the sequence matcher if it can still lift the
+    # score above the cutoff (the sequence ratio is at most 2*min/(len1+len2))
+    seq_cutoff = 0.0
+    if score_cutoff is not None:
+        seq_bound = 2 * min(len(clean1), len(clean2)) / (len(clean1) + len(clean2) or 1)
+        partial_bound = (
+            seq_bound * 0.3 +
+            substring_similarity * 0.3 +
+            word_overlap * 0.2 +
+            key_terms_similarity * 0.2
+        )
+        if partial_bound + 1e-9 <= score_cutoff:
+            return 0.0
+
+        # Lowest sequence ratio that could still beat the cutoff
+        other_similarity = substring_similarity * 0.3 + word_overlap * 0.2 + key_terms_similarity * 0.2
+        seq_cutoff = max(0.0, (score_cutoff - other_similarity) / 0.3 - 1e-6)
+
+    # Method 1: SequenceMatcher similarity
+    if clean1 == clean2:
+        seq_similarity = 1.0  # Identical strings need no matching
+    else:
+        matcher = SequenceMatcher(None, clean1, clean2)
+        # real_quick_ratio() and quick_ratio() are cheap upper bounds on ratio(); pairs whose
+        # bounds fall below seq_cutoff cannot beat the cutoff
+        if seq_cutoff and (matcher.real_quick_ratio() < seq_cutoff or matcher.quick_ratio() < seq_cutoff):
+            return 0.0
+        seq_similarity = matcher.ratio()
+
+    # Weighted combination of all methods
+    final_similarity = (
+        seq_similarity * 0.3 +
+        substring_similarity * 0.3 +
+        word_overlap * 0.2 +
+        key_terms_similarity * 0.2
+    )
+
+    return final_similarity
+
+def similarity_upper_bound(prep1: PreparedName, prep2: PreparedName) -> float:
+    """Cheap upper bound on calculate_prepared_similarity using only lengths and set sizes"""
+    len1, len2 = len(prep1.clean), len(prep2.clean)
+    if not len1 or not len2:
+        return 0.4  # Only word/key-term overlap could score
+
+    # Sequence ratio is at most 2*min/(len1+len2); substring similarity is at most the length ratio;
+    # a Jaccard index is at most the ratio of the smaller to the larger set
+    seq_bound = 2 * min(len1, len2) / (len1 + len2)
+    substring_bound = min(len1, len2) / max(len1, len2)
+    word_bound = _size_ratio(len(prep1.words), len(prep2.words))
+    key_terms_bound = _size_ratio(len(prep1.key_terms), len(prep2.key_terms))
+
+    return seq_bound * 0.3 + substring_bound * 0.3 + word_bound * 0.2 + key_terms_bound * 0.2
+
+def _jaccard(set1: FrozenSet[str], set2: FrozenSet[str]) -> float:
+    """Jaccard index of two sets (0.0 if either is empty)"""
+    if not set1 or not set2:
+        return 0.0
+    # |A | B| = |A| + |B| - |A & B|, so the union never has to be built
+    intersection = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
+
+def _size_ratio(size1: int, size2: int) -> float:
+    """Ratio of the smaller to the larger size (0.0 if either is empty)"""
+    if not size1 or not size2:
+        return 0.0
+    return min(size1, size2) / max(size1, size2)
+
+def prepare_project_mappings(project_mappings: Dict[str, Dict],
+                             prepare_name: Callable[[str], PreparedName]) -> List[Tuple[str, PreparedName]]:
+    """Prepare every project name once, returning (project_id, prepared_name) pairs"""
+    return [
+        (project_id, prepare_name(project_data.get('project_name', '')))
+        for project_id, project_data in project_mappings.items()
+    ]
+
+def build_key_term_index(prepared_projects: List[Tuple[str, PreparedName]]) -> Dict[str, List[int]]:
+    """Map each key term to the positions of the projects whose names contain it"""
+    key_term_index = defaultdict(list)
+    for position, (_, prepared_project) in enumerate(prepared_projects):
+        for term in prepared_project.key_terms:
+            key_term_index[term].append(position)
+    return dict(key_term_index)
+
+def find_best_fuzzy_match(prepared_name: PreparedName, prepared_projects: List[Tuple[str, PreparedName]],
+                          key_term_index: Optional[Dict[str, List[int]]] = None) -> Tuple[Optional[str], float]:
+    """Find the project with the highest similarity to a prepared name, as (project_id, similarity)
+
+    Ties go to the earlier project; the project ID is None if no project scores above 0.
+    """
+    best_match_id = None
+    best_similarity = 0.0
+
+    # Projects sharing a key term with the name are scored first: they are the likely
+    # winners, and a high early best score lets the cutoff skip most of the rest
+    positions = range(len(prepared_projects))
+    if key_term_index is not None:
+        sharing = set()
+        for term in prepared_name.key_terms:
+            sharing.update(key_term_index.get(term, ()))
+        positions = sorted(sharing) + [position for position in positions if position not in sharing]
+
+    best_position = None
+    for position in positions:
+        project_id, prepared_project = prepared_projects[position]
+
+        # Ties go to the earlier project, as in a plain in-order scan
+        earlier = best_position is not None and position < best_position
+        score_cutoff = best_similarity - 1e-9 if earlier else best_similarity
+
+        # Candidates that cannot beat the current best are cut off early
+        similarity = calculate_prepared_similarity(prepared_name, prepared_project, score_cutoff=score_cutoff)
+
+        if similarity > best_similarity or (earlier and similarity == best_similarity):
+            best_similarity = similarity
+            best_match_id = project_id
+            best_position = position
+
+    return best_match_id, best_similarity
+
+# Prepared project data shared by the tasks run in a worker process
+worker_projects: Dict = {}
+
+def init_worker(prepared_projects: List[Tuple[str, PreparedName]], key_term_index: Dict[str, List[int]]):
+    """Receive the prepared projects once per worker instead of once per task"""
+    worker_projects['prepared_projects'] = prepared_projects
+    worker_projects['key_term_index'] = key_term_index
+    worker_projects['match_cache'] = {}
+
+def map_in_workers(func: Callable[..., Any], max_workers: Optional[int],
+                   prepared_projects: List[Tuple[str, PreparedName]], key_term_index: Dict[str, List[int]],
+                   *iterables: Iterable) -> List[Any]:
+    """Run func over iterables in a process pool whose workers hold the prepared projects
+
+    Scoring is mostly Python-level work, so processes rather than threads are needed.
+    Results are returned in input order; None for max_workers uses one worker per CPU.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(prepared_projects, key_term_index)) as executor:
+        return list(executor.map(func, *iterables))
+
+def parse_workers(value: str) -> Optional[int]:
+    """argparse type for --workers: a process count, with 0 meaning one per CPU (None)"""
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid worker count: {value!r}") from None
+    if workers < 0:
+        raise argparse.ArgumentTypeError(f"worker count must be 0 (one per CPU) or more, got {workers}")
+    return workers or None
+
+def add_workers_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --workers option shared by the mapping scripts"""
+    parser.add_argument('--workers', type=parse_workers, default=1,
+                        help='processes used to match folders: 1 (default) matches in-process, '
+                             '0 uses one per CPU')
+
+def write_mapping(path, data) -> None:
+    """Write a mapping JSON file, indented only when PRETTY is set (the mapping is machine-consumed)
+
+    The UTF-8 payload is serialized once and written in a single call, with orjson when it is
+    installed; both serializers keep non-ASCII characters unescaped.
+    """
+    pretty = bool(os.environ.get('PRETTY'))
+    try:
+        import orjson
+    except ImportError:  # Fall back to the standard library json module
+        orjson = None
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    elif pretty:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    else:
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
@@ -3,86 +3,92 @@
 Script to recreate map_projectId_projectName.json from the provided project data
 """
 
+import hashlib
+import io
 import json
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
-def parse_project_data(data_text: str) -> List[Tuple[str, str]]:
-    """Parse the project data and extract project ID and name pairs"""
+# Patterns used when parsing the project data (ETP-XXX-XXX-XX or NO-ID-XXXXXXXX project IDs).
+# _LINE_RE classifies a stripped line in one match: 'id' for an ID followed by a name, 'dash' for a
+# tab-separated project without ID and 'skip' for other ID or dash lines; no match is a continuation.
+_LINE_RE = re.compile(r'(?P<id>(?:ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)\s)|(?P<dash>-.*\t)|(?P<skip>ETP-[A-Z0-9-]|NO-ID-[A-F0-9]|-)')
+_LINE_PREFIXES = ('ETP-', 'NO-ID-', '-')  # Every _LINE_RE alternative starts with one of these
+_ID_FULL_RE = re.compile(r'^(ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)\s+(.+)')
+_STATUS_PREFIX_RE = re.compile(r'^\[(Completed|Cancelled|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*')
+
+# Statuses recognised in project names, in priority order (each status is also its keyword)
+_NAME_STATUSES = ("Completed", "Cancelled", "On-going", "Approved", "Under procurement", "PSA TAF")
+
+def parse_project_data(lines: Iterable[str]) -> List[Tuple[str, str]]:
+    """Parse the project data lines and extract project ID and name pairs
+    
+    Lines are consumed one at a time, so an open file or io.StringIO can be passed directly.
+    """
     projects = []
-    lines = data_text.strip().split('\n')
     
+    # Name fragments of the current project, joined once when the project is saved
     current_project_id = None
-    current_project_name = ""
+    current_name_parts = []
     
     for i, line in enumerate(lines):
         line = line.strip()
         if not line or line == "Project ID\tProject name":
             continue
-            
-        # Check if line starts with a project ID (ETP-XXX-XXX-XX or NO-ID-XXXXXXXX)
-        if re.match(r'^(ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)\s+', line):
+        
+        # Only lines starting with an ID prefix or a dash can match _LINE_RE; skip the regex for the rest
+        line_type = None
+        if line.startswith(_LINE_PREFIXES):
+            line_match = _LINE_RE.match(line)
+            if line_match:
+                line_type = line_match.lastgroup
+        
+        # Line starts with a project ID (ETP-XXX-XXX-XX or NO-ID-XXXXXXXX)
+        if line_type == 'id':
             # Save previous project if exists
-            if current_project_id and current_project_name:
-                projects.append((current_project_id, current_project_name.strip()))
+            if current_project_id and current_name_parts:
+                projects.append((current_project_id, " ".join(current_name_parts)))
             
             # Extract new project ID and name
             parts = line.split('\t', 1)
             if len(parts) == 2:
-                current_project_id = parts[0].strip()
-                current_project_name = parts[1].strip()
+                # The line is already stripped, so only the sides next to the tab need it
+                current_project_id = parts[0].rstrip()
+                current_name_parts = [parts[1].lstrip()]
             else:
                 # Handle case where ID and name are separated by spaces
-                match = re.match(r'^(ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)\s+(.+)', line)
+                match = _ID_FULL_RE.match(line)
                 if match:
                     current_project_id = match.group(1)
-                    current_project_name = match.group(2)
+                    current_name_parts = [match.group(2)]
                 else:
                     current_project_id = line
-                    current_project_name = ""
+                    current_name_parts = []
         
-        # Check if line starts with just a dash (indicating no ID)
-        elif line.startswith('-') and '\t' in line:
+        # Line starts with just a dash (indicating no ID)
+        elif line_type == 'dash':
             # Save previous project if exists
-            if current_project_id and current_project_name:
-                projects.append((current_project_id, current_project_name.strip()))
+            if current_project_id and current_name_parts:
+                projects.append((current_project_id, " ".join(current_name_parts)))
             
             # This is a project without ID
-            parts = line.split('\t', 1)
-            if len(parts) == 2:
-                current_project_id = None
-                current_project_name = parts[1].strip()
-            else:
-                current_project_id = None
-                current_project_name = line[1:].strip()  # Remove the dash
-        
-        # Check if line starts with just spaces or tabs (continuation of previous project name)
-        elif line.startswith('\t') or (line and not re.match(r'^(ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)', line) and not line.startswith('-')):
-            # This is a continuation of the project name
-            if current_project_name:
-                current_project_name += " " + line.strip()
-            else:
-                current_project_name = line.strip()
-        
-        # Check if this is a new project without ID (starts with tab or spaces)
-        elif line and not line.startswith('-') and not re.match(r'^(ETP-[A-Z0-9-]+|NO-ID-[A-F0-9]+)', line):
-            # Save previous project if exists
-            if current_project_id and current_project_name:
-                projects.append((current_project_id, current_project_name.strip()))
-            
-            # This is a new project without ID
             current_project_id = None
-            current_project_name = line.strip()
+            current_name_parts = [line.split('\t', 1)[1].lstrip()]
+        
+        # Any other line is a continuation of the project name (the line is already stripped)
+        elif line_type is None:
+            current_name_parts.append(line)
     
     # Don't forget the last project
+    current_project_name = " ".join(current_name_parts)
     if current_project_id and current_project_name:
-        projects.append((current_project_id, current_project_name.strip()))
+        projects.append((current_project_id, current_project_name))
     elif current_project_name and not current_project_id:
-        # Generate a NO-ID for projects without ID
-        import hashlib
+        # Generate a NO-ID for projects without ID (MD5, matching the IDs already persisted
+        # in map_projectId_projectName.json and append_to_map_projectId.generate_no_id)
         project_hash = hashlib.md5(current_project_name.encode()).hexdigest()[:8].upper()
-        projects.append((f"NO-ID-{project_hash}", current_project_name.strip()))
+        projects.append((f"NO-ID-{project_hash}", current_project_name))
     
     return projects
 
@@ -91,20 +97,13 @@ def determine_project_status(project_id: str, project_name: str) -> str:
     if not project_id:
         return "Unknown"
     
-    # Check for specific patterns in project name
-    if "[Completed]" in project_name or "Completed" in project_name:
-        return "Completed"
-    elif "[Cancelled]" in project_name or "Cancelled" in project_name:
-        return "Cancelled"
-    elif "[On-going]" in project_name or "On-going" in project_name:
-        return "On-going"
-    elif "[Approved]" in project_name or "Approved" in project_name:
-        return "Approved"
-    elif "[Under procurement]" in project_name or "Under procurement" in project_name:
-        return "Under procurement"
-    elif "PSA TAF" in project_name:
-        return "PSA TAF"
-    elif "EU" in project_id:
+    # Check for specific patterns in project name (the bracketed "[Completed]" etc. forms
+    # contain the bare keyword, so one scan per keyword covers both)
+    for status in _NAME_STATUSES:
+        if status in project_name:
+            return status
+    
+    if "EU" in project_id:
         return "On-going - EU"
     elif project_id.startswith("ETP-"):
         return "On-going"  # Default for ETP projects
@@ -116,12 +115,6 @@ def determine_project_status(project_id: str, project_name: str) -> str:
 def create_map_projectId_projectName(projects: List[Tuple[str, str]]) -> Dict:
     """Create the map_projectId_projectName.json structure"""
     
-    # Count projects by status
-    status_counts = {}
-    for project_id, project_name in projects:
-        status = determine_project_status(project_id, project_name)
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
     # Create the main structure
     result = {
         "extraction_date": datetime.now().isoformat() + "Z",
@@ -137,7 +130,7 @@ def create_map_projectId_projectName(projects: List[Tuple[str, str]]) -> Dict:
             
         # Clean project name (remove status prefixes)
         clean_name = project_name
-        clean_name = re.sub(r'^\[(Completed|Cancelled|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*', '', clean_name)
+        clean_name = _STATUS_PREFIX_RE.sub('', clean_name)
         clean_name = clean_name.strip()
         
         status = determine_project_status(project_id, project_name)
@@ -317,7 +310,7 @@ Reconductoring for Vietnam, Indonesia, and Philippines"
 """
     
     print("Parsing project data...")
-    projects = parse_project_data(project_data)
+    projects = parse_project_data(io.StringIO(project_data))
     
     print(f"Found {len(projects)} projects")
     
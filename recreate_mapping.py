@@ -4,93 +4,114 @@ Script to recreate file_to_projectId_mapping.json using fuzzy matching
 between project names in project_names.json and map_projectId_projectName.json
 """
 
+import argparse
 import json
 import re
-from difflib import SequenceMatcher
+from bisect import bisect_left
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from project_matching import (PreparedName, add_workers_argument, build_key_term_index, calculate_prepared_similarity,
+                              find_best_fuzzy_match, map_in_workers, prepare_clean_name,
+                              prepare_project_mappings, worker_projects, write_mapping)
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Patterns used when cleaning and comparing project names
+# One pass over the optional prefixes, in order: status, country_year_contractor_, retainer and
+# any remaining country_year_contractor_
+_PREFIXES_RE = re.compile(
+    r'^(?:\[(?:Completed|Cancelled|New|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*)?'
+    r'(?:[A-Z]{3}_\d{4}_[^_]+_)?'
+    r'(?:[A-Z]{3}_\d{4}_Retainer\|[^_]+_)?'
+    r'(?:[A-Z]{3}_\d{4}_[^_]+_)?'
+)
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-\(\)]')  # Everything except word chars, whitespace, hyphens and parentheses
+
 def clean_project_name(name: str) -> str:
     """Clean project name for better matching"""
     # Remove common prefixes and suffixes
-    name = re.sub(r'^\[(Completed|Cancelled|New|On-going|Approved|Under procurement|Unknown|PSA TAF)\]\s*', '', name)
-    name = re.sub(r'^[A-Z]{3}_\d{4}_[^_]+_', '', name)  # Remove country_year_contractor_ prefix
-    name = re.sub(r'^[A-Z]{3}_\d{4}_Retainer\|[^_]+_', '', name)  # Remove retainer prefix
-    name = re.sub(r'^[A-Z]{3}_\d{4}_[^_]+_', '', name)  # Remove any remaining country_year_contractor_ prefix
+    name = name[_PREFIXES_RE.match(name).end():]
     
     # Normalize whitespace and special characters
-    name = re.sub(r'\s+', ' ', name.strip())
-    name = re.sub(r'[^\w\s\-\(\)]', '', name)  # Remove special chars except hyphens and parentheses
+    name = " ".join(name.split())
+    name = _SPECIAL_CHARS_RE.sub('', name)  # Remove special chars except hyphens and parentheses
     
     return name.lower()
 
+def prepare_name(name: str) -> PreparedName:
+    """Clean and tokenize a name once so it can be compared many times"""
+    return prepare_clean_name(clean_project_name(name))
+
 def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity between two strings using multiple methods"""
-    # Clean both strings
-    clean1 = clean_project_name(str1)
-    clean2 = clean_project_name(str2)
-    
-    # Method 1: SequenceMatcher similarity
-    seq_similarity = SequenceMatcher(None, clean1, clean2).ratio()
-    
-    # Method 2: Check if one is contained in the other (substring match)
-    substring_similarity = 0.0
-    if clean1 in clean2 or clean2 in clean1:
-        substring_similarity = min(len(clean1), len(clean2)) / max(len(clean1), len(clean2))
-    
-    # Method 3: Word overlap similarity
-    words1 = set(clean1.split())
-    words2 = set(clean2.split())
-    if words1 and words2:
-        word_overlap = len(words1.intersection(words2)) / len(words1.union(words2))
-    else:
-        word_overlap = 0.0
-    
-    # Method 4: Check for key terms match
-    key_terms1 = set(re.findall(r'\b\w{4,}\b', clean1))  # Words with 4+ characters
-    key_terms2 = set(re.findall(r'\b\w{4,}\b', clean2))
-    if key_terms1 and key_terms2:
-        key_terms_similarity = len(key_terms1.intersection(key_terms2)) / len(key_terms1.union(key_terms2))
-    else:
-        key_terms_similarity = 0.0
-    
-    # Weighted combination of all methods
-    final_similarity = (
-        seq_similarity * 0.3 +
-        substring_similarity * 0.3 +
-        word_overlap * 0.2 +
-        key_terms_similarity * 0.2
-    )
-    
-    return final_similarity
+    return calculate_prepared_similarity(prepare_name(str1), prepare_name(str2))
 
-def find_best_match(file_name: str, project_mappings: Dict[str, Dict]) -> Tuple[Optional[str], float]:
+def find_best_match(file_name: str, prepared_projects: List[Tuple[str, PreparedName]],
+                    key_term_index: Optional[Dict[str, List[int]]] = None) -> Tuple[Optional[str], float]:
     """Find the best matching project ID for a given file name"""
-    best_match_id = None
-    best_similarity = 0.0
-    
-    for project_id, project_data in project_mappings.items():
-        project_name = project_data.get('project_name', '')
-        similarity = calculate_similarity(file_name, project_name)
-        
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match_id = project_id
-    
-    return best_match_id, best_similarity
+    return find_best_fuzzy_match(prepare_name(file_name), prepared_projects, key_term_index)
+
+def match_files(file_names: List[str], prepared_projects: List[Tuple[str, PreparedName]],
+                key_term_index: Dict[str, List[int]]) -> List[Tuple[str, Optional[str], float]]:
+    """Find the best match of each file, returning (file_name, best_match_id, similarity) triples"""
+    return [
+        (file_name, *find_best_match(file_name, prepared_projects, key_term_index))
+        for file_name in file_names
+    ]
 
-def recreate_mapping(threshold: float = 0.6) -> Dict:
-    """Recreate the file_to_projectId_mapping.json using fuzzy matching"""
+def _match_files_in_worker(file_names: List[str]) -> List[Tuple[str, Optional[str], float]]:
+    """match_files() using the worker's prepared projects"""
+    return match_files(file_names, worker_projects['prepared_projects'], worker_projects['key_term_index'])
+
+def find_best_matches(max_workers: Optional[int] = 1) -> Dict[str, List[Tuple[str, Optional[str], float]]]:
+    """Find the best matching project for every file, grouped by folder
+    
+    The result does not depend on the threshold, so it can be computed once and
+    passed to recreate_mapping() for each threshold being tried. Folders are matched
+    in-process when max_workers is 1, otherwise across a process pool (None uses one
+    worker per CPU).
+    """
     
     # Load the data files
-    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/project_names.json', 'r') as f:
-        project_names_data = json.load(f)
+    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/project_names.json', 'rb') as f:
+        project_names_data = orjson.loads(f.read()) if orjson else json.load(f)
     
-    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'r') as f:
-        project_mappings_data = json.load(f)
+    with open('/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/map_projectId_projectName.json', 'rb') as f:
+        project_mappings_data = orjson.loads(f.read()) if orjson else json.load(f)
     
-    # Extract project mappings
+    # Extract project mappings, preparing each project name once up front
     project_mappings = project_mappings_data.get('projects', {})
+    prepared_projects = prepare_project_mappings(project_mappings, prepare_name)
+    key_term_index = build_key_term_index(prepared_projects)
+    
+    # Find the best match for each file of each folder (folders are independent of each other)
+    folders = {
+        folder_name: folder_data.get('projects', [])
+        for folder_name, folder_data in project_names_data.get('folders', {}).items()
+    }
+    if max_workers == 1:
+        folder_results = [
+            match_files(file_names, prepared_projects, key_term_index)
+            for file_names in folders.values()
+        ]
+    else:
+        folder_results = map_in_workers(_match_files_in_worker, max_workers, prepared_projects, key_term_index,
+                                        folders.values())
+    
+    return dict(zip(folders, folder_results))
+
+def recreate_mapping(threshold: float = 0.6,
+                     best_matches: Optional[Dict[str, List[Tuple[str, Optional[str], float]]]] = None) -> Dict:
+    """Recreate the file_to_projectId_mapping.json using fuzzy matching
+    
+    best_matches is the output of find_best_matches(); it is computed if not given.
+    """
+    if best_matches is None:
+        best_matches = find_best_matches()
     
     # Initialize result structure
     result = {
@@ -108,17 +129,13 @@ def recreate_mapping(threshold: float = 0.6) -> Dict:
     all_unmatched = []
     
     # Process each folder
-    for folder_name, folder_data in project_names_data.get('folders', {}).items():
-        folder_projects = folder_data.get('projects', [])
+    for folder_name, folder_best_matches in best_matches.items():
         folder_matches = {}
         folder_unmatched = []
         
-        for file_name in folder_projects:
+        for file_name, best_match_id, similarity in folder_best_matches:
             total_files += 1
             
-            # Find best match
-            best_match_id, similarity = find_best_match(file_name, project_mappings)
-            
             if similarity >= threshold and best_match_id:
                 folder_matches[file_name] = best_match_id
                 total_matches += 1
@@ -129,7 +146,7 @@ def recreate_mapping(threshold: float = 0.6) -> Dict:
         # Store folder results
         result["folders"][folder_name] = {
             "folder_name": folder_name,
-            "total_files": len(folder_projects),
+            "total_files": len(folder_best_matches),
             "matched_files": len(folder_matches),
             "unmatched_files": len(folder_unmatched),
             "mappings": folder_matches,
@@ -146,33 +163,47 @@ def recreate_mapping(threshold: float = 0.6) -> Dict:
 
 def main():
     """Main function to recreate the mapping file"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_workers_argument(parser)
+    args = parser.parse_args()
+    
     print("Recreating file_to_projectId_mapping.json using fuzzy matching...")
     
+    # Match every file once; only the threshold changes between the attempts below
+    # (--workers other than 1 matches folders in parallel processes)
+    best_matches = find_best_matches(max_workers=args.workers)
+    
+    # Matched scores in ascending order: the number of matches at a threshold is the count of
+    # scores at or above it, so each threshold is a bisection instead of a full result build
+    matched_scores = sorted(
+        similarity
+        for folder_best_matches in best_matches.values()
+        for _, best_match_id, similarity in folder_best_matches
+        if best_match_id
+    )
+    total_files = sum(len(folder_best_matches) for folder_best_matches in best_matches.values())
+    
     # Try different thresholds to find the best balance
     thresholds = [0.5, 0.6, 0.7, 0.8]
-    best_result = None
     best_threshold = 0.6
     
     for threshold in thresholds:
         print(f"\nTrying threshold: {threshold}")
-        result = recreate_mapping(threshold)
+        total_matches = len(matched_scores) - bisect_left(matched_scores, threshold)
         
-        match_rate = result["total_matches_found"] / result["total_files_processed"] if result["total_files_processed"] > 0 else 0
-        print(f"  Matches: {result['total_matches_found']}/{result['total_files_processed']} ({match_rate:.1%})")
+        match_rate = total_matches / total_files if total_files > 0 else 0
+        print(f"  Matches: {total_matches}/{total_files} ({match_rate:.1%})")
         
         # Choose the threshold with the best balance of matches and quality
         if match_rate > 0.15:  # At least 15% match rate
-            best_result = result
             best_threshold = threshold
     
-    if best_result is None:
-        best_result = recreate_mapping(0.6)
-        best_threshold = 0.6
+    # Build the result only for the chosen threshold
+    best_result = recreate_mapping(best_threshold, best_matches)
     
     # Save the result
     output_file = '/home/john/Desktop/rbmf-2025-data-processor/data/2025-output/file_to_projectId_mapping.json'
-    with open(output_file, 'w') as f:
-        json.dump(best_result, f, indent=2)
+    write_mapping(output_file, best_result)
     
     print(f"\n✅ Recreated mapping file with threshold {best_threshold}")
     print(f"📁 Output saved to: {output_file}")
@@ -4,11 +4,90 @@ Recreate file_to_projectId_mapping.json using the original map_projectId_project
 """
 
 import json
+import os
 import uuid
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
-from fuzzywuzzy import fuzz
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+
+from project_matching import write_mapping
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+def match_files(file_names: List[str], project_names: List[str]) -> List[Tuple[Optional[int], int]]:
+    """Return (index of the best project name or None, score) for each file name
+    
+    Scores are round(100 * SequenceMatcher.ratio()) of the lowercased names, as fuzzywuzzy's
+    fuzz.ratio computed them; the first project with the highest score wins and only scores
+    of 90+ match.
+    """
+    if not project_names:
+        return [(None, 0)] * len(file_names)
+    
+    # Lowercase every name once rather than once per pair; names that repeat (ignoring case)
+    # are matched once and share the result
+    lower_file_names = list(dict.fromkeys(file_name.lower() for file_name in file_names))
+    lower_project_names = [project_name.lower() for project_name in project_names]
+    
+    matches = _match_names_by_length(lower_file_names, lower_project_names)
+    matches_by_name = dict(zip(lower_file_names, matches))
+    return [matches_by_name[file_name.lower()] for file_name in file_names]
+
+def _match_names_by_length(lower_file_names: List[str], lower_project_names: List[str]) -> List[Tuple[Optional[int], int]]:
+    """match_files() for lowercased names, scoring only projects whose name length and bigrams allow a match"""
+    # Project positions ordered by name length, so the projects whose length allows a match
+    # can be found by bisection
+    by_length = sorted(range(len(lower_project_names)), key=lambda index: len(lower_project_names[index]))
+    sorted_lengths = [len(lower_project_names[index]) for index in by_length]
+    project_bigrams = [frozenset(zip(name, name[1:])) for name in lower_project_names]
+    
+    matches = []
+    for lower_file_name in lower_file_names:
+        best_index = None
+        best_score = 0
+        
+        # The ratio is at most 2*min/(len1+len2), so only project lengths within
+        # [0.895/1.105, 1.105/0.895] of the file length can reach a rounded 90 (a raw 89.5)
+        file_length = len(lower_file_name)
+        low = bisect_left(sorted_lengths, -(-895 * file_length // 1105))
+        high = bisect_right(sorted_lengths, 1105 * file_length // 895)
+        file_bigrams = frozenset(zip(lower_file_name, lower_file_name[1:]))
+        
+        # Candidates are scored in their original order, so the first highest score still wins
+        for index in sorted(by_length[low:high]):
+            lower_project_name = lower_project_names[index]
+            
+            # Identical names score 100, which no later project can beat
+            if lower_file_name == lower_project_name:
+                if best_score < 100:
+                    best_score = 100
+                    best_index = index
+                break
+            
+            # A raw 89.5 allows at most 0.105*(len1+len2) single-character insertions and
+            # deletions, and each one changes at most 3 bigrams, so pairs whose bigram sets
+            # differ by more than that cannot match
+            total_length = file_length + len(lower_project_name)
+            if 1000 * len(file_bigrams ^ project_bigrams[index]) > 315 * total_length:
+                continue
+            
+            # Calculate similarity score
+            score = round(100 * SequenceMatcher(None, lower_file_name, lower_project_name).ratio())
+            
+            if score > best_score and score >= 90:  # 90% threshold
+                best_score = score
+                best_index = index
+                if score == 100:
+                    break  # Nothing later can score higher
+        
+        matches.append((best_index, best_score))
+    return matches
 
 def recreate_file_mapping():
     """Recreate file_to_projectId_mapping.json using original data."""
@@ -21,13 +100,13 @@ def recreate_file_mapping():
     
     # Load project names
     print("Loading project names...")
-    with open(project_names_file, 'r', encoding='utf-8') as f:
-        project_names_data = json.load(f)
+    with open(project_names_file, 'rb') as f:
+        project_names_data = orjson.loads(f.read()) if orjson else json.load(f)
     
     # Load project ID mappings
     print("Loading project ID mappings...")
-    with open(project_mapping_file, 'r', encoding='utf-8') as f:
-        project_mapping_data = json.load(f)
+    with open(project_mapping_file, 'rb') as f:
+        project_mapping_data = orjson.loads(f.read()) if orjson else json.load(f)
     
     # Create a lookup dictionary: project_name -> project_id
     project_name_to_id = {}
@@ -36,6 +115,8 @@ def recreate_file_mapping():
         project_name_to_id[project_name] = project_id
     
     print(f"Loaded {len(project_name_to_id)} project names for matching")
+    project_matches = list(project_name_to_id.items())
+    project_names = [project_name for project_name, _ in project_matches]
     
     # Process each folder
     results = {
@@ -46,7 +127,16 @@ def recreate_file_mapping():
         'folders': {}
     }
     
-    unmatched_files = []
+    # Per-file match lines are only printed when VERBOSE is set; otherwise each folder gets one summary line
+    verbose = bool(os.environ.get('VERBOSE'))
+    
+    # Match every distinct file name once, across all folders
+    all_file_names = list(dict.fromkeys(
+        file_name
+        for folder_data in project_names_data['folders'].values()
+        for file_name in folder_data['projects']
+    ))
+    best_matches = dict(zip(all_file_names, match_files(all_file_names, project_names)))
     
     for folder_name, folder_data in project_names_data['folders'].items():
         print(f"\nProcessing folder: {folder_name}")
@@ -62,41 +152,36 @@ def recreate_file_mapping():
         
         for file_name in folder_data['projects']:
             results['total_files_processed'] += 1
-            
-            # Try fuzzy matching
-            best_match = None
-            best_score = 0
-            
-            for project_name, project_id in project_name_to_id.items():
-                # Calculate similarity score
-                score = fuzz.ratio(file_name.lower(), project_name.lower())
-                
-                if score > best_score and score >= 90:  # 90% threshold
-                    best_score = score
-                    best_match = (project_name, project_id)
+            best_index, best_score = best_matches[file_name]
+            best_match = project_matches[best_index] if best_index is not None else None
             
             if best_match:
                 project_name, project_id = best_match
                 folder_results['mappings'][file_name] = project_id
                 folder_results['matched_files'] += 1
                 results['total_matches_found'] += 1
-                print(f"  ✓ {file_name} -> {project_id} (score: {best_score})")
+                if verbose:
+                    print(f"  ✓ {file_name} -> {project_id} (score: {best_score})")
             else:
                 folder_results['unmatched_files'] += 1
                 folder_results['unmatched_list'].append(file_name)
-                unmatched_files.append(f"{folder_name}: {file_name}")
-                print(f"  ✗ {file_name} (no match found)")
+                if verbose:
+                    print(f"  ✗ {file_name} (no match found)")
         
+        print(f"  {folder_results['matched_files']}/{folder_results['total_files']} files matched")
         results['folders'][folder_name] = folder_results
     
-    # Add summary
-    results['unmatched_count'] = len(unmatched_files)
-    results['unmatched_files'] = unmatched_files
+    # Add summary; the flat unmatched list is built from the per-folder lists
+    results['unmatched_count'] = results['total_files_processed'] - results['total_matches_found']
+    results['unmatched_files'] = [
+        f"{folder_name}: {file_name}"
+        for folder_name, folder_results in results['folders'].items()
+        for file_name in folder_results['unmatched_list']
+    ]
     
     # Save results
     print(f"\nSaving results to {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    write_mapping(output_file, results)
     
     # Print summary
     print(f"\n📊 File Mapping Summary (Original Data):")
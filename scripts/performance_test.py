@@ -47,17 +47,13 @@ def run_performance_test():
         logger.info(f"Testing: {config['name']}")
         logger.info(f"{'='*60}")
         
-        # Set configuration
-        import os
-        os.environ['PARALLEL_PROCESSING'] = str(config['parallel_processing'])
-        if config['max_workers']:
-            os.environ['MAX_WORKERS'] = str(config['max_workers'])
-        
-        # Initialize transformer
+        # Initialize transformer with the tested configuration
         transformer = OptimizedRBMFTransformer(
             data_dir=data_dir,
             include_steps=False,  # Use final mode for speed
-            target_folders=["test"]  # Test with test folder first
+            target_folders=["test"],  # Test with test folder first
+            parallel_processing=config['parallel_processing'],
+            max_workers=config['max_workers']
         )
         
         # Initialize performance monitor
@@ -1,15 +1,96 @@
 """Main entry point for RBMF Data Processor."""
 
-import json
+import atexit
+import gzip
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from loguru import logger
 import click
+import orjson
 
 from .rbmf_processor.config import settings
 from .rbmf_processor.data_processor import DataProcessor
 from .rbmf_processor.gdown_client import GDownClient
 from .rbmf_processor.rbmf_transformer import RBMFTransformer
-from .rbmf_processor.optimized_transformer import OptimizedRBMFTransformer
+from .rbmf_processor.parallel_processor import ParallelProcessor, create_file_task, process_single_file_worker
+
+# A folder selection: comma-separated numbers and ranges such as "1-3"
+_SELECTION_RE = re.compile(r'\s*\d+\s*(?:-\s*\d+\s*)?(?:,\s*\d+\s*(?:-\s*\d+\s*)?)*')
+_SELECTION_PART_RE = re.compile(r'(\d+)(?:\s*-\s*(\d+))?')
+
+# Files with these extensions are treated as Excel files without reading them
+_EXCEL_SUFFIXES = ('.xlsx', '.xlsm', '.xls')
+
+
+def _write_json(path: Path, data: dict, compress: bool = False):
+    """Write a report as indented UTF-8 JSON.
+    
+    Args:
+        path: Path of the JSON file to write
+        data: Report data; values JSON cannot represent are written with str()
+        compress: Whether to gzip the file (at the fastest compression level)
+    """
+    payload = orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    
+    if compress:
+        with gzip.open(path, 'wb', compresslevel=1) as f:
+            f.write(payload)
+    else:
+        Path(path).write_bytes(payload)
+
+
+def _list_project_files(folder_path: Path) -> list:
+    """List the project file names in a folder.
+    
+    Args:
+        folder_path: Path to the project folder
+        
+    Returns:
+        Sorted names of the files in the folder, skipping hidden and system files
+    """
+    # os.scandir entries cache their file type, so no extra stat call is needed per file
+    with os.scandir(folder_path) as entries:
+        projects = [
+            entry.name for entry in entries
+            if entry.is_file() and not entry.name.startswith(('.', '~'))
+        ]
+    
+    # Sort projects alphabetically
+    projects.sort()
+    return projects
+
+
+def _list_excel_files(transformer: RBMFTransformer, folder_path: Path) -> list:
+    """List the Excel files in a folder.
+    
+    Args:
+        transformer: Transformer used to check files without an Excel extension by content
+        folder_path: Path to the folder
+        
+    Returns:
+        Paths of the Excel files in the folder
+    """
+    excel_files = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            # Files with an Excel extension are taken as is (skipping Office lock files); only
+            # other files are opened to check their content
+            if entry.name.lower().endswith(_EXCEL_SUFFIXES):
+                if not entry.name.startswith('~$'):
+                    excel_files.append(Path(entry.path))
+            elif transformer._is_excel_file(Path(entry.path)):
+                excel_files.append(Path(entry.path))
+    return excel_files
 
 
 def _interactive_folder_selection(data_dir: Path) -> list:
@@ -46,16 +127,13 @@ def _interactive_folder_selection(data_dir: Path) -> list:
                 print("❌ No selection made. Please try again.")
                 continue
             
-            # Parse selection
-            selected_indices = []
-            for part in selection.split(','):
-                part = part.strip()
-                if '-' in part:
-                    # Handle ranges like "1-3"
-                    start, end = map(int, part.split('-'))
-                    selected_indices.extend(range(start, end + 1))
-                else:
-                    selected_indices.append(int(part))
+            # Parse selection; ranges like "1-3" expand to every number in them
+            if not _SELECTION_RE.fullmatch(selection):
+                raise ValueError(f"Invalid selection: {selection}")
+            selected_indices = list(chain.from_iterable(
+                range(int(start), int(end or start) + 1)
+                for start, end in _SELECTION_PART_RE.findall(selection)
+            ))
             
             # Validate indices
             max_index = len(available_folders) + 1
@@ -94,27 +172,33 @@ def setup_logging():
     # Add console handler (only if not in quiet mode)
     if not settings.quiet_mode:
         logger.add(
-            sink=lambda msg: print(msg, end=""),
+            sink=sys.stdout,
             level=settings.log_level,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
         )
     else:
         # Quiet mode: only show WARNING and ERROR on console
         logger.add(
-            sink=lambda msg: print(msg, end=""),
+            sink=sys.stdout,
             level="WARNING",
             format="<red>{time:HH:mm:ss}</red> | <level>{level: <8}</level> | <level>{message}</level>"
         )
     
-    # Add file handler (always enabled for debugging)
+    # Add file handler (always enabled for debugging); records are written by a background
+    # thread so logging calls do not block on disk writes
     log_level = settings.log_level if settings.verbose_logging else "WARNING"
     logger.add(
         sink=settings.log_dir / "rbmf_processor.log",
         level=log_level,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="10 MB",
-        retention="7 days"
+        retention="7 days",
+        enqueue=True
     )
+    
+    # Flush queued records before the process exits
+    atexit.unregister(logger.complete)
+    atexit.register(logger.complete)
 
 
 @click.group()
@@ -147,12 +231,12 @@ def download(folder_url: str, output_dir: Path):
             'folder_url': folder_url,
             'download_path': str(output_dir),
             'files_downloaded': len(downloaded_files),
-            'downloaded_files': [str(f) for f in downloaded_files]
+            # Paths are written as strings by the JSON serializer's str() fallback
+            'downloaded_files': downloaded_files
         }
         
         summary_file = Path(output_dir) / "download_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        _write_json(summary_file, summary)
         
         logger.info(f"Download summary saved to: {summary_file}")
         
@@ -192,8 +276,7 @@ def process(data_dir: Path, output_file: str):
         else:
             report_path = Path(data_dir) / "processing_report.json"
         
-        with open(report_path, 'w') as f:
-            json.dump(summary, f, indent=2, default=str)
+        _write_json(report_path, summary)
         
         logger.info(f"Processing report saved to: {report_path}")
         
@@ -217,7 +300,10 @@ def process(data_dir: Path, output_file: str):
               help='Output report file name')
 @click.option('--quiet', is_flag=True, 
               help='Quiet mode - minimal console output for better performance')
-def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, filter: bool, report_file: str, quiet: bool):
+@click.option('--compress', is_flag=True, 
+              help='Write the report gzip-compressed (report file name + .gz)')
+def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, filter: bool, report_file: str, quiet: bool,
+              compress: bool):
     """Transform RBMF data from quarterly to half-yearly format.
     
     Default: Creates Instructions + RBMF tabs only (efficient for production)
@@ -226,6 +312,7 @@ def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, fi
     --interactive: Show interactive folder selection menu
     --filter: Apply filtering to RBMF tab based on Strategic Outcome + Indicator name groups
     --quiet: Minimal console output for better performance
+    --compress: Write the report as <report-file>.gz
     """
     # Enable quiet mode if requested
     if quiet:
@@ -286,14 +373,8 @@ def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, fi
         
         transformer.create_output_structure(output_mode)
         
-        # Process each target folder
-        # Determine mode description
-        if steps:
-            mode_desc = 'steps'
-        elif filter:
-            mode_desc = 'final-filter'
-        else:
-            mode_desc = 'final'
+        # Process each target folder; the output mode also names each folder's output subfolder
+        mode_desc = output_mode
         
         results = {
             'total_files': 0,
@@ -303,76 +384,92 @@ def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, fi
             'folder_results': {}
         }
         
+        # List the files of every folder first, so that parallel processing can run all of
+        # them in a single process pool instead of one pool per folder
+        folders_to_process = []
         for folder_name in transformer.target_folders:
             source_folder = transformer.data_dir / folder_name
-            
-            # Determine output folder name
-            if steps:
-                output_folder_name = "steps"
-            elif filter:
-                output_folder_name = "final-filter"
-            else:
-                output_folder_name = "final"
-            
-            output_folder = transformer.output_dir / folder_name / output_folder_name
+            output_folder = transformer.output_dir / folder_name / output_mode
             
             if not source_folder.exists():
                 logger.warning(f"Source folder does not exist: {source_folder}")
                 continue
             
-            logger.info(f"Processing folder: {folder_name}")
+            # Get all files to process
+            files_to_process = _list_excel_files(transformer, source_folder)
+            
+            folders_to_process.append((folder_name, output_folder, files_to_process))
+        
+        # Check if parallel processing should be used
+        total_files_to_process = sum(len(files_to_process) for _, _, files_to_process in folders_to_process)
+        use_parallel = (
+            settings.parallel_processing and 
+            total_files_to_process > 1
+        )
+        
+        if use_parallel:
+            logger.info(f"Using parallel processing for {total_files_to_process} files in {len(folders_to_process)} folders")
             
-            folder_results = {
-                'files_created': 0,
-                'files_failed': 0,
-                'file_results': []
+            # One task per file across all folders; task_folders[i] is the folder of file_tasks[i]
+            transformer_config = {
+                'data_dir': str(transformer.data_dir),
+                'include_steps': steps,
+                'apply_filter': filter
             }
+            file_tasks = []
+            task_folders = []
+            for folder_name, output_folder, files_to_process in folders_to_process:
+                results['folder_results'][folder_name] = {
+                    'files_created': 0,
+                    'files_failed': 0,
+                    'file_results': []
+                }
+                for file_path in files_to_process:
+                    file_tasks.append(create_file_task(
+                        source_file=file_path,
+                        output_file=output_folder / file_path.name,
+                        transformer_config=transformer_config
+                    ))
+                    task_folders.append(folder_name)
             
-            # Get all files to process
-            files_to_process = list(source_folder.glob('*'))
-            files_to_process = [f for f in files_to_process if f.is_file() and transformer._is_excel_file(f)]
-            
-            # Check if parallel processing should be used
-            use_parallel = (
-                settings.parallel_processing and 
-                len(files_to_process) > 1
+            parallel_processor = ParallelProcessor(max_workers=settings.max_workers)
+            parallel_results = parallel_processor.process_files_parallel(
+                file_tasks=file_tasks,
+                process_func=process_single_file_worker,
+                chunk_size=1
             )
             
-            if use_parallel:
-                logger.info(f"Using parallel processing for {len(files_to_process)} files in folder: {folder_name}")
+            for folder_name, file_result in zip(task_folders, parallel_results):
+                folder_results = results['folder_results'][folder_name]
                 
-                # Use optimized transformer for parallel processing
-                optimized_transformer = OptimizedRBMFTransformer(
-                    data_dir=data_dir,
-                    include_steps=steps,
-                    target_folders=[folder_name],
-                    apply_filter=filter
-                )
+                # Convert parallel result format to expected format
+                converted_result = {
+                    'file_name': file_result['file_name'],
+                    'created': file_result['success'],
+                    'output_file': file_result.get('output_file'),
+                    'error': file_result.get('error')
+                }
+                folder_results['file_results'].append(converted_result)
                 
-                # Process folder with parallel processing
-                parallel_results = optimized_transformer._process_folder_optimized(folder_name)
-                
-                # Convert parallel results to match expected format
-                folder_results['files_created'] = parallel_results['files_created']
-                folder_results['files_failed'] = parallel_results['files_failed']
-                folder_results['file_results'] = []
-                
-                for file_result in parallel_results['file_results']:
-                    # Convert parallel result format to expected format
-                    converted_result = {
-                        'file_name': file_result['file_name'],
-                        'created': file_result['success'],
-                        'output_file': file_result.get('output_file'),
-                        'error': file_result.get('error')
-                    }
-                    folder_results['file_results'].append(converted_result)
+                # Update folder and global results
+                results['total_files'] += 1
+                if file_result['success']:
+                    results['created_files'] += 1
+                    folder_results['files_created'] += 1
+                else:
+                    results['failed_files'] += 1
+                    folder_results['files_failed'] += 1
+        
+        else:
+            for folder_name, output_folder, files_to_process in folders_to_process:
+                logger.info(f"Processing folder: {folder_name}")
                 
-                # Update global results
-                results['total_files'] += parallel_results['files_processed']
-                results['created_files'] += parallel_results['files_created']
-                results['failed_files'] += parallel_results['files_failed']
+                folder_results = {
+                    'files_created': 0,
+                    'files_failed': 0,
+                    'file_results': []
+                }
                 
-            else:
                 logger.info(f"Using sequential processing for {len(files_to_process)} files in folder: {folder_name}")
                 
                 # Process all files in the folder sequentially
@@ -430,13 +527,14 @@ def transform(data_dir: Path, folders: tuple, interactive: bool, steps: bool, fi
                     else:
                         results['failed_files'] += 1
                         folder_results['files_failed'] += 1
-            
-            results['folder_results'][folder_name] = folder_results
+                
+                results['folder_results'][folder_name] = folder_results
         
         # Save results to report file
         report_path = Path(data_dir) / report_file
-        with open(report_path, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if compress:
+            report_path = report_path.with_name(report_path.name + '.gz')
+        _write_json(report_path, results, compress=compress)
         
         logger.info(f"Transformation completed ({mode_desc}). Report saved to: {report_path}")
         logger.info(f"Total files processed: {results['total_files']}")
@@ -493,20 +591,14 @@ def list_projects(data_dir: Path, output_file: str):
             'folders': {}
         }
         
-        for folder_name in existing_folders:
-            folder_path = Path(data_dir) / folder_name
-            projects = []
-            
-            # Get all files in the folder
-            for file_path in folder_path.glob('*'):
-                if file_path.is_file():
-                    # Skip hidden files and system files
-                    if not file_path.name.startswith('.') and not file_path.name.startswith('~'):
-                        projects.append(file_path.name)
-            
-            # Sort projects alphabetically
-            projects.sort()
-            
+        # List the folders concurrently; each listing is one directory scan
+        with ThreadPoolExecutor(max_workers=len(existing_folders)) as executor:
+            folder_projects = list(executor.map(
+                _list_project_files,
+                [Path(data_dir) / folder_name for folder_name in existing_folders]
+            ))
+        
+        for folder_name, projects in zip(existing_folders, folder_projects):
             project_data['folders'][folder_name] = {
                 'folder_name': folder_name,
                 'project_count': len(projects),
@@ -522,8 +614,7 @@ def list_projects(data_dir: Path, output_file: str):
         
         # Save to JSON file
         output_path = output_dir / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(project_data, f, indent=2, ensure_ascii=False)
+        _write_json(output_path, project_data)
         
         logger.info(f"Project names saved to: {output_path}")
         logger.info(f"Total projects found: {project_data['total_projects']}")
@@ -14,7 +14,8 @@ from .config import settings
 class OptimizedRBMFTransformer(RBMFTransformer):
     """Optimized RBMF transformer with performance improvements."""
     
-    def __init__(self, data_dir: Path, include_steps: bool = False, target_folders: list = None, apply_filter: bool = False):
+    def __init__(self, data_dir: Path, include_steps: bool = False, target_folders: list = None, apply_filter: bool = False,
+                 parallel_processing: Optional[bool] = None, max_workers: Optional[int] = None):
         """Initialize optimized transformer.
         
         Args:
@@ -22,12 +23,17 @@ class OptimizedRBMFTransformer(RBMFTransformer):
             include_steps: Whether to include intermediate steps
             target_folders: List of target folders to process
             apply_filter: Whether to apply filtering to RBMF data
+            parallel_processing: Whether to process files in parallel. Defaults to settings.parallel_processing
+            max_workers: Maximum number of worker processes. Defaults to settings.max_workers
         """
         super().__init__(data_dir, include_steps, target_folders)
         self.apply_filter = apply_filter
+        self.parallel_processing = settings.parallel_processing if parallel_processing is None else parallel_processing
         
         # Initialize performance components
-        self.parallel_processor = ParallelProcessor(max_workers=settings.max_workers)
+        self.parallel_processor = ParallelProcessor(
+            max_workers=settings.max_workers if max_workers is None else max_workers
+        )
         self.memory_optimizer = MemoryOptimizer(max_memory_usage=settings.max_memory_usage)
         self.excel_optimizer = ExcelOptimizer()
         
@@ -147,7 +153,7 @@ class OptimizedRBMFTransformer(RBMFTransformer):
             file_tasks.append(task)
         
         # Process files in parallel or sequentially
-        if settings.parallel_processing and len(file_tasks) > 1:
+        if self.parallel_processing and len(file_tasks) > 1:
             logger.info(f"Processing {len(file_tasks)} files in parallel")
             file_results = self.parallel_processor.process_files_parallel(
                 file_tasks=file_tasks,
@@ -32,26 +32,27 @@ class ParallelProcessor:
             chunk_size: Number of files per worker (for memory optimization)
             
         Returns:
-            List of processing results
+            List of processing results, in the same order as file_tasks
         """
-        results = []
+        results = [None] * len(file_tasks)
         start_time = time.time()
         
         logger.info(f"Starting parallel processing of {len(file_tasks)} files with {self.max_workers} workers")
         
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tasks
-            future_to_task = {
-                executor.submit(process_func, task): task 
-                for task in file_tasks
+            future_to_index = {
+                executor.submit(process_func, task): index 
+                for index, task in enumerate(file_tasks)
             }
             
             # Collect results as they complete
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
+                task = file_tasks[index]
                 try:
                     result = future.result()
-                    results.append(result)
+                    results[index] = result
                     
                     if result.get('success', False):
                         logger.info(f"✅ Completed: {task.get('file_name', 'Unknown')}")
@@ -60,11 +61,11 @@ class ParallelProcessor:
                         
                 except Exception as e:
                     logger.error(f"❌ Exception processing {task.get('file_name', 'Unknown')}: {e}")
-                    results.append({
+                    results[index] = {
                         'file_name': task.get('file_name', 'Unknown'),
                         'success': False,
                         'error': str(e)
-                    })
+                    }
         
         elapsed_time = time.time() - start_time
         successful = sum(1 for r in results if r.get('success', False))
@@ -93,6 +94,10 @@ def create_file_task(source_file: Path, output_file: Path, transformer_config: D
         'config': transformer_config
     }
 
+# Transformers created by process_single_file_worker in this process, keyed by
+# (data_dir, include_steps)
+_worker_transformers: Dict[tuple, Any] = {}
+
 def process_single_file_worker(task: Dict[str, Any]) -> Dict[str, Any]:
     """Worker function for processing a single file.
     
@@ -111,16 +116,22 @@ def process_single_file_worker(task: Dict[str, Any]) -> Dict[str, Any]:
         output_file = Path(task['output_file'])
         config = task['config']
         
-        # Create transformer instance
-        transformer = RBMFTransformer(
-            data_dir=Path(config['data_dir']),
-            include_steps=config['include_steps'],
-            target_folders=None
-        )
-        
-        # Load required data
-        transformer.load_template_instructions()
-        transformer.load_file_to_project_id_mapping()
+        # Reuse this process's transformer for the same configuration, so the template
+        # instructions and project ID mapping are loaded once per worker rather than per file
+        transformer_key = (config['data_dir'], config['include_steps'])
+        transformer = _worker_transformers.get(transformer_key)
+        if transformer is None:
+            # Create transformer instance
+            transformer = RBMFTransformer(
+                data_dir=Path(config['data_dir']),
+                include_steps=config['include_steps'],
+                target_folders=[]
+            )
+            
+            # Load required data
+            transformer.load_template_instructions()
+            transformer.load_file_to_project_id_mapping()
+            _worker_transformers[transformer_key] = transformer
         
         # Process file
         apply_filter = config.get('apply_filter', False)
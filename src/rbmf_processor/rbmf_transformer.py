@@ -6,11 +6,23 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from copy import copy
+from difflib import SequenceMatcher
 from loguru import logger
 import json
 
 from .config import settings
 
+# Results of discover_available_folders, keyed by the data directory and the modification
+# times of its folders, so repeated discovery in one process skips the folder scan
+_available_folders_cache: Dict[tuple, List[str]] = {}
+
+# Results of _is_excel_file, keyed by file path, modification time and size
+_excel_file_cache: Dict[tuple, bool] = {}
+
+# Instructions tabs read by load_template_instructions, keyed by template path and
+# modification time
+_template_instructions_cache: Dict[tuple, pd.DataFrame] = {}
+
 
 class RBMFTransformer:
     """Creates files with Instructions tab from template."""
@@ -149,9 +161,8 @@ class RBMFTransformer:
             if not original:
                 continue
                 
-            # Calculate fuzzy match score
-            from fuzzywuzzy import fuzz
-            score = fuzz.ratio(value.strip(), original.strip())
+            # Calculate fuzzy match score (fuzzywuzzy's ratio without python-Levenshtein)
+            score = round(100 * SequenceMatcher(None, value.strip(), original.strip()).ratio())
             
             if score >= threshold and score > best_score:
                 best_match = mapping
@@ -197,9 +208,8 @@ class RBMFTransformer:
             if not original:
                 continue
                 
-            # Calculate fuzzy match score
-            from fuzzywuzzy import fuzz
-            score = fuzz.ratio(indicator_name.strip(), original.strip())
+            # Calculate fuzzy match score (fuzzywuzzy's ratio without python-Levenshtein)
+            score = round(100 * SequenceMatcher(None, indicator_name.strip(), original.strip()).ratio())
             
             if score >= threshold and score > best_score:
                 best_match = mapping
@@ -272,22 +282,33 @@ class RBMFTransformer:
             '.pytest_cache', 'node_modules', '.vscode', '.idea'
         }
         
-        for item in self.data_dir.iterdir():
+        candidate_folders = [
+            item for item in self.data_dir.iterdir()
             if (item.is_dir() and 
                 item.name not in excluded_folders and
-                not item.name.startswith('.')):
-                
-                # Check if folder contains Excel files
-                has_excel_files = False
-                for file_path in item.glob('*'):
-                    if (file_path.is_file() and 
-                        (file_path.suffix.lower() in ['.xlsx', '.xls'] or 
-                         self._is_excel_file(file_path))):
-                        has_excel_files = True
-                        break
-                
-                if has_excel_files:
-                    available_folders.append(item.name)
+                not item.name.startswith('.'))
+        ]
+        
+        # A folder's modification time changes when files are added, removed or renamed in it
+        cache_key = (
+            str(self.data_dir.resolve()),
+            tuple(sorted((item.name, item.stat().st_mtime_ns) for item in candidate_folders))
+        )
+        if cache_key in _available_folders_cache:
+            return list(_available_folders_cache[cache_key])
+        
+        for item in candidate_folders:
+            # Check if folder contains Excel files
+            has_excel_files = False
+            for file_path in item.glob('*'):
+                if (file_path.is_file() and 
+                    (file_path.suffix.lower() in ['.xlsx', '.xls'] or 
+                     self._is_excel_file(file_path))):
+                    has_excel_files = True
+                    break
+            
+            if has_excel_files:
+                available_folders.append(item.name)
         
         # Sort folders for consistent ordering
         available_folders.sort()
@@ -297,6 +318,7 @@ class RBMFTransformer:
         else:
             logger.warning("No folders with Excel files found in data directory")
         
+        _available_folders_cache[cache_key] = list(available_folders)
         return available_folders
     
     def validate_folders(self, folder_names: list) -> tuple[list, list]:
@@ -424,11 +446,18 @@ class RBMFTransformer:
         if not self.template_file.exists():
             raise FileNotFoundError(f"Template file not found: {self.template_file}")
         
+        # Reuse the Instructions tab already read in this process unless the template changed
+        cache_key = (str(self.template_file.resolve()), self.template_file.stat().st_mtime_ns)
+        if cache_key in _template_instructions_cache:
+            self.template_instructions = _template_instructions_cache[cache_key]
+            return self.template_instructions
+        
         try:
             # Read the Instructions tab
             instructions_df = pd.read_excel(self.template_file, sheet_name='Instructions')
             logger.info(f"Loaded Instructions template with {len(instructions_df)} rows")
             self.template_instructions = instructions_df
+            _template_instructions_cache[cache_key] = instructions_df
             return instructions_df
             
         except Exception as e:
@@ -480,7 +509,7 @@ class RBMFTransformer:
             else:
                 folder_path = self.output_dir / folder / "final"
             
-            folder_path.mkdir(exist_ok=True)
+            folder_path.mkdir(parents=True, exist_ok=True)
             
             # Clean up existing files in the output folder
             if folder_path.exists():
@@ -2605,6 +2634,25 @@ class RBMFTransformer:
     def _is_excel_file(self, file_path: Path) -> bool:
         """Check if a file is an Excel file by content.
         
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            True if the file is an Excel file, False otherwise
+        """
+        # Files already checked in this process are not read again unless they changed
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        if cache_key not in _excel_file_cache:
+            _excel_file_cache[cache_key] = self._read_excel_header(file_path)
+        return _excel_file_cache[cache_key]
+    
+    def _read_excel_header(self, file_path: Path) -> bool:
+        """Check whether a file can be opened as an Excel workbook.
+        
         Args:
             file_path: Path to the file
             
@@ -0,0 +1,35 @@
+"""Tests for the Excel formatting check."""
+
+import re
+import zipfile
+
+import openpyxl
+
+from check_formatting import check_excel_formatting
+
+
+def test_read_only_check_without_dimension_element(tmp_path, capsys):
+    """Test that a sheet without a <dimension> element is checked in read-only mode."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "RBMF"
+    for row in range(3):
+        ws.append([f"r{row}c{col}" for col in range(7)])
+    saved = tmp_path / "saved.xlsx"
+    wb.save(saved)
+
+    # Copy the workbook without the sheet's <dimension> element, as some writers produce it
+    path = tmp_path / "no_dimension.xlsx"
+    with zipfile.ZipFile(saved) as source, zipfile.ZipFile(path, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension[^>]*/>", b"", data)
+            target.writestr(item, data)
+
+    assert check_excel_formatting(path, check_dimensions=False)
+    output = capsys.readouterr().out
+    assert "Total rows: 3" in output
+    assert "Total columns: 7" in output
+    assert "Column 5: Font size" in output
+    assert "Column 6: Font size" not in output
@@ -0,0 +1,59 @@
+"""Tests for the project mapping cleanups."""
+
+import json
+
+import pytest
+
+from cleanup_mapping import cleanup_mapping, load_mapping, remove_added, restore_original, revert_added
+
+
+PROJECTS = {
+    "ETP-001": {"project_name": "Solar Mini-Grid", "has_original_id": True},
+    "NO-ID-AAAA1111": {"project_name": "Original without ID", "has_original_id": False},
+    "NO-ID-7170A0B2": {"project_name": "Listed added NO-ID", "has_original_id": False},
+    "22393-001": {"project_name": "Added 22393 project", "has_original_id": True},
+    "NO-ID-BBBB2222": {"project_name": "Added for dash entry", "has_original_id": True},
+    "22393-003": {"project_name": "Another 22393 project", "has_original_id": True},
+    "OTHER-1": {"project_name": "Other ID format", "has_original_id": True},
+}
+
+
+@pytest.fixture
+def mapping_file(tmp_path):
+    """Write a mapping file holding PROJECTS."""
+    path = tmp_path / "map_projectId_projectName.json"
+    path.write_text(json.dumps({
+        "extraction_date": "2025-09-10T00:00:00Z",
+        "total_projects": len(PROJECTS),
+        "projects": PROJECTS,
+    }), encoding="utf-8")
+    return path
+
+
+def test_remove_added():
+    """Test that the 22393 projects and NO-ID projects with an original ID are removed."""
+    assert list(remove_added(PROJECTS)) == ["ETP-001", "NO-ID-AAAA1111", "NO-ID-7170A0B2", "22393-003", "OTHER-1"]
+
+
+def test_restore_original():
+    """Test that only ETP projects and NO-ID projects without an original ID are kept."""
+    assert list(restore_original(PROJECTS)) == ["ETP-001", "NO-ID-AAAA1111", "NO-ID-7170A0B2"]
+
+
+def test_revert_added():
+    """Test that all 22393 projects and the listed NO-ID projects are removed."""
+    assert list(revert_added(PROJECTS)) == ["ETP-001", "NO-ID-AAAA1111", "NO-ID-BBBB2222", "OTHER-1"]
+
+
+def test_cleanups_in_order_match_running_the_old_scripts(mapping_file):
+    """Test that --revert --remove writes what revert_mapping.py then remove_added_projects.py wrote."""
+    cleanup_mapping(["revert", "remove"], mapping_file)
+
+    assert load_mapping(mapping_file) == {
+        "extraction_date": "2025-09-05T04:20:00Z",
+        "total_projects": 3,
+        "projects": {
+            project_id: PROJECTS[project_id]
+            for project_id in ("ETP-001", "NO-ID-AAAA1111", "OTHER-1")
+        },
+    }
@@ -0,0 +1,35 @@
+"""Tests for the command line helpers."""
+
+import pytest
+
+from src.main import _SELECTION_PART_RE, _SELECTION_RE
+
+
+@pytest.mark.parametrize("selection,parts", [
+    ("3", [("3", "")]),
+    ("1,4", [("1", ""), ("4", "")]),
+    ("1-3", [("1", "3")]),
+    ("1 - 3", [("1", "3")]),
+    ("2 ,5-7, 9", [("2", ""), ("5", "7"), ("9", "")]),
+    ("10-12", [("10", "12")]),
+])
+def test_selection_accepts_numbers_and_ranges(selection, parts):
+    """Test that numbers and ranges, with spaces around "," and "-", are parsed."""
+    assert _SELECTION_RE.fullmatch(selection)
+    assert _SELECTION_PART_RE.findall(selection) == parts
+
+
+@pytest.mark.parametrize("selection", [
+    "1,",
+    "1,2,",
+    ",1",
+    "a",
+    "1,b",
+    "1-",
+    "-3",
+    "1 2",
+    "1--3",
+])
+def test_selection_rejects_malformed_input(selection):
+    """Test that trailing commas, letters and incomplete ranges are rejected."""
+    assert _SELECTION_RE.fullmatch(selection) is None
@@ -0,0 +1,57 @@
+"""Tests for the shared project name matching."""
+
+import argparse
+
+import pytest
+
+import improved_mapping
+import recreate_mapping
+from project_matching import add_workers_argument, calculate_prepared_similarity
+
+
+# Scores from the original difflib-based calculate_similarity
+KNOWN_SIMILARITIES = [
+    ("Rural Road Rehabilitation Project", "rural road rehabilitation project", 1.0),
+    ("[Completed] Water Supply Improvement", "Water Supply Improvement Phase 2", 0.7521428571428571),
+    ("Bridge Construction in Davao", "Davao Bridge Construction", 0.5650943396226416),
+    ("School Building Program", "Hospital Equipment Upgrade", 0.14693877551020407),
+    ("Flood Control (Phase II)", "Flood Control Phase II", 0.5536231884057972),
+    ("Irrigation", "Irrigation System Expansion", 0.4066066066066066),
+]
+
+
+@pytest.mark.parametrize("module", [improved_mapping, recreate_mapping])
+@pytest.mark.parametrize("name1,name2,expected", KNOWN_SIMILARITIES)
+def test_calculate_similarity_known_pairs(module, name1, name2, expected):
+    """Test that known name pairs keep their similarity scores."""
+    assert module.calculate_similarity(name1, name2) == pytest.approx(expected, abs=1e-12)
+
+
+def test_calculate_similarity_uses_each_scripts_cleaner():
+    """Test that only recreate_mapping strips the country_year_contractor_ prefix."""
+    name1, name2 = "PHI_2024_Contractor_Coastal Protection Works", "Coastal Protection Works"
+
+    assert improved_mapping.calculate_similarity(name1, name2) == pytest.approx(0.5754010695187165, abs=1e-12)
+    assert recreate_mapping.calculate_similarity(name1, name2) == 1.0
+
+
+@pytest.mark.parametrize("name1,name2,expected", KNOWN_SIMILARITIES)
+def test_score_cutoff_keeps_scores_above_cutoff(name1, name2, expected):
+    """Test that a cutoff below the score does not change it and one above it can only prune it to 0."""
+    prep1, prep2 = improved_mapping.prepare_name(name1), improved_mapping.prepare_name(name2)
+
+    assert calculate_prepared_similarity(prep1, prep2, score_cutoff=expected - 0.01) == pytest.approx(expected, abs=1e-12)
+    assert calculate_prepared_similarity(prep1, prep2, score_cutoff=expected + 0.01) in (0.0, pytest.approx(expected, abs=1e-12))
+
+
+def test_workers_option():
+    """Test that --workers defaults to in-process matching, maps 0 to one per CPU and rejects bad counts."""
+    parser = argparse.ArgumentParser()
+    add_workers_argument(parser)
+
+    assert parser.parse_args([]).workers == 1
+    assert parser.parse_args(["--workers", "4"]).workers == 4
+    assert parser.parse_args(["--workers", "0"]).workers is None
+    for value in ("-1", "two"):
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--workers", value])
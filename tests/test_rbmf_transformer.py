@@ -0,0 +1,42 @@
+"""Tests for the RBMF transformer's fuzzy value mapping."""
+
+import pytest
+
+from src.rbmf_processor.rbmf_transformer import RBMFTransformer
+
+
+# (value, original_value, score) with the scores fuzzywuzzy 0.18.0 gave without python-Levenshtein;
+# the first three score 90 or more with an Indel-based ratio
+OUTCOME_SCORES = [
+    ("SO4 - Knodledge and Awareness Bdilbdig", "SO4 - Knowledge and Awareness Building", 87),
+    ("SO2 - Sustainable Eer yb iFinance", "SO2 - Sustainable Energy Finance", 89),
+    ("SO4 - Knowledge & Awareness Building", "SO4 - Knowledge and Awareness Building", 95),
+]
+INDICATOR_SCORES = [
+    ("Number of polibies suppordecd", "Number of policies supported", 88),
+    ("Number of people trained on energy transitions", "Number of people trained on energy transition", 99),
+]
+
+
+@pytest.fixture
+def transformer(tmp_path):
+    """Create a transformer without scanning for folders."""
+    return RBMFTransformer(tmp_path, target_folders=[])
+
+
+@pytest.mark.parametrize("value,original,score", OUTCOME_SCORES)
+def test_fuzzy_match_value_scores(transformer, value, original, score):
+    """Test that a value matches at its baseline score but not one point above it."""
+    mappings = [{"column": "Strategic Outcome", "original_value": original, "new_value": "NEW"}]
+
+    assert transformer._fuzzy_match_value(value, mappings, "Strategic Outcome", threshold=score) == "NEW"
+    assert transformer._fuzzy_match_value(value, mappings, "Strategic Outcome", threshold=score + 1) == value
+
+
+@pytest.mark.parametrize("name,original,score", INDICATOR_SCORES)
+def test_find_best_indicator_mapping_scores(transformer, name, original, score):
+    """Test that an indicator matches at its baseline score but not one point above it."""
+    mapping = {"column": "Indicator name", "original_value": original, "new_value": "NEW"}
+
+    assert transformer._find_best_indicator_mapping(name, [mapping], threshold=score) == mapping
+    assert transformer._find_best_indicator_mapping(name, [mapping], threshold=score + 1) is None
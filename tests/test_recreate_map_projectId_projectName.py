@@ -0,0 +1,38 @@
+"""Tests for parsing the project ID and name data."""
+
+import io
+
+from recreate_map_projectId_projectName import parse_project_data
+
+
+PROJECT_DATA = """Project ID\tProject name
+ETP-PHI-001-01\t[Completed] Rural Electrification
+  of Island Villages
+
+ETP-INO-002-02 Solar Mini-Grid Programme
+-\tCommunity Energy Study
+NO-ID-1A2B3C4D\tLegacy Project
+ETP-VNM-999
+-
+Wind Resource Assessment
+-\tFinal Project Without ID
+"""
+
+
+def test_parse_project_data():
+    """Test ETP, NO-ID and "-" lines, name continuations and skipped lines."""
+    assert parse_project_data(io.StringIO(PROJECT_DATA)) == [
+        # Tab and space separated IDs; continuation lines are joined to the name
+        ("ETP-PHI-001-01", "[Completed] Rural Electrification of Island Villages"),
+        ("ETP-INO-002-02", "Solar Mini-Grid Programme"),
+        # "Community Energy Study" has no ID and is followed by another project, so it is dropped.
+        # The ID-only line and the lone "-" are skipped, so the next line continues this name.
+        ("NO-ID-1A2B3C4D", "Legacy Project Wind Resource Assessment"),
+        # A trailing project without ID gets an MD5-based NO-ID
+        ("NO-ID-876426A3", "Final Project Without ID"),
+    ]
+
+
+def test_parse_project_data_accepts_a_list_of_lines():
+    """Test that any iterable of lines gives the same result as a file."""
+    assert parse_project_data(PROJECT_DATA.splitlines()) == parse_project_data(io.StringIO(PROJECT_DATA))
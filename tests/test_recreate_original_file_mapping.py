@@ -0,0 +1,109 @@
+"""Tests for matching file names to the original project names."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from recreate_original_file_mapping import match_files
+
+
+def brute_force_match_files(file_names, project_names):
+    """Score every pair, keeping the first highest score of 90 or more (the baseline loop)."""
+    matches = []
+    for file_name in file_names:
+        best_index, best_score = None, 0
+        for index, project_name in enumerate(project_names):
+            score = round(100 * SequenceMatcher(None, file_name.lower(), project_name.lower()).ratio())
+            if score > best_score and score >= 90:
+                best_index, best_score = index, score
+        matches.append((best_index, best_score))
+    return matches
+
+
+def mutate(rng, name, edits):
+    """Apply random single-character insertions, deletions and substitutions to a name."""
+    chars = list(name)
+    for _ in range(edits):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.choice("ids") if chars else "i"
+        if operation == "i":
+            chars.insert(position, rng.choice("abcdeFGhij -"))
+        elif operation == "d":
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice("abcdeFGhij -")
+    return "".join(chars)
+
+
+# (file_name, project_name, score) with the scores fuzzywuzzy 0.18.0 gave without python-Levenshtein;
+# the 89s score 93 with an Indel-based ratio
+BORDERLINE_SCORES = [
+    ("Supporting JETP sreeicrtariat", "Supporting JETP Secretariat", 89),
+    ("supportig jetp secreatoaiat", "supporting jetp secretariat", 89),
+    ("JETOPPWER System Analysis", "JETP Power System Analysis", 90),
+    ("jetp power syese analysis", "jetp power system analysis", 90),
+]
+
+
+@pytest.mark.parametrize("file_name,project_name,score", BORDERLINE_SCORES)
+def test_match_files_borderline_scores(file_name, project_name, score):
+    """Test that only scores of 90 or more match, using the baseline difflib scores."""
+    expected = (0, score) if score >= 90 else (None, 0)
+
+    assert match_files([file_name], [project_name]) == [expected]
+
+
+def test_match_files_first_highest_score_wins():
+    """Test that the first project with the highest score is chosen."""
+    projects = [
+        "jetp power system analyses",  # 96
+        "JETP Power System Analysis",  # 100, case is ignored
+        "jetp power system analysis",  # 100, but later
+    ]
+
+    assert match_files(["jetp power system analysis"], projects) == [(1, 100)]
+    assert match_files(["jetp power system analysi"], projects[::-1]) == [(0, 98)]
+
+
+def test_match_files_repeated_and_unmatched_names():
+    """Test that names repeating up to case share a result and unmatched names give (None, 0)."""
+    assert match_files(["Solar Study", "SOLAR STUDY", "Wind"], ["solar study"]) == [(0, 100), (0, 100), (None, 0)]
+    assert match_files(["Solar Study"], []) == [(None, 0)]
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_match_files_agrees_with_brute_force(seed):
+    """Test that the length window, bigram bound and early exits never change a result."""
+    rng = random.Random(seed)
+    bases = ["".join(rng.choice("abcdeFGhij -") for _ in range(rng.randint(5, 50))) for _ in range(20)]
+    project_names = bases + [mutate(rng, rng.choice(bases), rng.randint(0, 4)) for _ in range(40)] + [""]
+    file_names = [mutate(rng, rng.choice(bases), rng.randint(0, 6)) for _ in range(200)] + ["", bases[0].upper()]
+
+    assert match_files(file_names, project_names) == brute_force_match_files(file_names, project_names)
+
+
+def test_match_files_length_window_edges():
+    """Test that the length index keeps projects at the very edge of a possible 90."""
+    # Distinct characters keep difflib's autojunk heuristic out of the way, so a name extended by
+    # k characters scores 2*179/(358+k): 0.895 (a rounded 90) for k=42 and 89 for k=43
+    name = "".join(chr(0x100 + offset) for offset in range(179))
+    extended = [name + "".join(chr(0x300 + offset) for offset in range(k)) for k in (42, 43)]
+
+    assert match_files([name], extended) == [(0, 90)]
+    assert match_files([name], extended[::-1]) == [(1, 90)]
+    assert match_files(extended, [name]) == [(0, 90), (None, 0)]
+
+
+def test_match_files_stops_only_at_a_perfect_score():
+    """Test that the scan stops at the first 100 but not at an earlier lower match."""
+    projects = ["solar studys", "SOLAR STUDY", "solar study", "solar studys"]
+
+    assert match_files(["Solar Study"], projects) == [(1, 100)]
+    assert match_files(["Solar Study"], projects[:1]) == [(0, 96)]
+
+
+def test_match_files_bigram_bound_keeps_tight_pairs():
+    """Test that a 90 whose bigram sets differ almost as much as the bound allows still matches."""
+    # 9 differing bigrams against a limit of 0.315 * (15 + 14) = 9.135
+    assert match_files(["hkrkpijgjbyafrc"], ["hkrkpjjobyafrc"]) == [(0, 90)]